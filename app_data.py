@@ -0,0 +1,279 @@
+import hashlib
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+DATA_DIR = 'data'
+
+# Coordinates and key columns matched against exact values (the decay of the band tables) keep float64;
+# every other float column is an index value stored as float32
+FLOAT64_COLUMNS = ['Longitude', 'Latitude', 'decay']
+
+
+def data_path(name):
+    return os.path.join(DATA_DIR, name)
+
+
+def file_token(path, content_hash=False):
+    """Cache key for a file's current version: its mtime and size, or its content hash."""
+    if content_hash:
+        from ingest import file_hash
+
+        return file_hash(path)
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def clean_names(names):
+    # The GIS export pads some border names with spaces and non-breaking spaces
+    return pd.Series(names, dtype='string').str.strip()
+
+
+def compact(df):
+    """Categorical, whitespace-stripped Border_Name and float32 value columns."""
+    if 'Border_Name' in df.columns:
+        df['Border_Name'] = clean_names(df['Border_Name']).astype('category')
+    for col in df.columns[df.dtypes == np.float64]:
+        if col not in FLOAT64_COLUMNS:
+            df[col] = df[col].astype(np.float32)
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def _read_table(path, token):
+    return compact(pd.read_csv(path))
+
+
+def load_table(name, content_hash=False):
+    """A CSV from `data/`, parsed once per file version and process; None if the file is missing."""
+    path = data_path(name)
+    if not os.path.exists(path):
+        return None
+    return _read_table(path, file_token(path, content_hash))
+
+
+# Result tables offered in the Download Data tab, by file in data/
+DOWNLOAD_TABLES = {
+    'mpi_border_results.csv': 'MPI by Border',
+    'mpi_market_results.csv': 'MPI by Market',
+    'mpi_border_bands.csv': 'MPI Uncertainty Bands',
+    'ci_results.csv': 'CI Results',
+    'ci_bands.csv': 'CI Uncertainty Bands',
+    'mpi_summary.csv': 'MPI by Ethnic Group',
+    'aggregated_market_metrics.csv': 'Aggregated Market Metrics',
+    'aggregated_border_metrics.csv': 'Aggregated Border Metrics',
+}
+DOWNLOAD_FORMATS = {'CSV': ('csv', 'text/csv'), 'Parquet': ('parquet', 'application/vnd.apache.parquet')}
+BUNDLE_NAME = 'borderland_results.zip'
+
+# Larger downloads are written once to static/downloads/ and linked, not held in memory
+STATIC_DOWNLOAD_BYTES = 50 * 1024 * 1024
+DOWNLOAD_DIR = os.path.join('static', 'downloads')
+# Streamlit answers 404 for static files over this size (MAX_APP_STATIC_FILE_SIZE)
+STATIC_FILE_LIMIT_BYTES = 200 * 1024 * 1024
+
+
+def available_downloads():
+    return {name: label for name, label in DOWNLOAD_TABLES.items() if os.path.exists(data_path(name))}
+
+
+def _serialise(path, fmt):
+    if fmt == 'csv':
+        # The original file, at full precision, rather than the compacted table
+        with open(path, 'rb') as f:
+            return f.read()
+    buffer = io.BytesIO()
+    pd.read_csv(path).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _bundle(paths):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for path in paths:
+            bundle.write(path, os.path.basename(path))
+    return buffer.getvalue()
+
+
+def _zipped(name, data):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        bundle.writestr(name, data)
+    return buffer.getvalue()
+
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def _download_bytes(path, fmt, token):
+    return _serialise(path, fmt)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _bundle_bytes(paths, tokens):
+    return _bundle(paths)
+
+
+def download_size(names):
+    return sum(os.path.getsize(data_path(name)) for name in names)
+
+
+def download_bytes(name, fmt):
+    """Serialised table, built on the first request for this file version and shared by every session."""
+    path = data_path(name)
+    return _download_bytes(path, fmt, file_token(path))
+
+
+def bundle_bytes(names):
+    """Zip of the given tables as CSV."""
+    paths = tuple(data_path(name) for name in names)
+    return _bundle_bytes(paths, tuple(file_token(path) for path in paths))
+
+
+def _static_file(filename, build):
+    """URL of `filename` in static/downloads/, written by `build` if missing; None if too large to serve."""
+    os.makedirs(DOWNLOAD_DIR, exist_ok=True)
+    path = os.path.join(DOWNLOAD_DIR, filename)
+    if not os.path.exists(path):
+        # Write then rename so a concurrent request never serves a partial file
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(build())
+        os.replace(tmp_path, path)
+    if os.path.getsize(path) > STATIC_FILE_LIMIT_BYTES:
+        os.remove(path)
+        return None
+    return 'app/static/downloads/' + filename
+
+
+@st.cache_data(show_spinner=False)
+def _static_download(path, fmt, token):
+    from ingest import file_hash
+
+    stem = f'{os.path.splitext(os.path.basename(path))[0]}-{file_hash(path)[:12]}'
+    url = _static_file(f'{stem}.{fmt}', lambda: _serialise(path, fmt))
+    if url is None:
+        # Over the static file limit; zipped, a CSV is a fraction of its size
+        name = f'{os.path.splitext(os.path.basename(path))[0]}.{fmt}'
+        url = _static_file(f'{stem}.{fmt}.zip', lambda: _zipped(name, _serialise(path, fmt)))
+    return url
+
+
+@st.cache_data(show_spinner=False)
+def _static_bundle(paths, tokens):
+    from ingest import file_hash
+
+    digest = ''.join(file_hash(path)[:12] for path in paths)
+    stem = os.path.splitext(BUNDLE_NAME)[0]
+    return _static_file(f'{stem}-{hashlib.sha256(digest.encode()).hexdigest()[:12]}.zip', lambda: _bundle(paths))
+
+
+def static_download(name, fmt):
+    """URL of a static copy of a large table, named by its content hash.
+
+    Zipped when the table itself is over STATIC_FILE_LIMIT_BYTES; None when even the zip is.
+    """
+    path = data_path(name)
+    return _static_download(path, fmt, file_token(path))
+
+
+def static_bundle(names):
+    """URL of a static zip of the given tables; None when it is over STATIC_FILE_LIMIT_BYTES."""
+    paths = tuple(data_path(name) for name in names)
+    return _static_bundle(paths, tuple(file_token(path) for path in paths))
+
+
+@st.cache_resource(show_spinner=False)
+def _load_cube(path, token):
+    from ci import load_cube as load_arrays
+
+    cube = dict(load_arrays(path))
+    cube['border_names'] = clean_names(cube['border_names']).to_numpy(dtype=str)
+    return cube
+
+
+def load_cube(name):
+    """Memory-mapped CI cube, shared read-only by every session until its files change."""
+    path = data_path(name)
+    return _load_cube(path, file_token(os.path.join(path, 'prefix.npy')))
+
+
+@st.cache_data(show_spinner=False)
+def _ci_matrix(path, token):
+    cube = _load_cube(path, token)
+    named = cube['border_names'] != ''
+    matrix = pd.DataFrame(np.asarray(cube['cube'])[named], index=cube['border_names'][named], columns=cube['bins'])
+    matrix = matrix.groupby(level=0).sum()
+    return matrix.rename_axis(index='Border_Name', columns='year').stack().rename('CI').reset_index()
+
+
+def ci_matrix(name='ci_cube'):
+    """Long-form (Border_Name, year, CI) table of an annual cube, summed over border posts sharing a name."""
+    path = data_path(name)
+    return _ci_matrix(path, file_token(os.path.join(path, 'prefix.npy')))
+
+
+@st.cache_resource(show_spinner=False)
+def _load_sweep(path, token):
+    from mpi import load_sweep as load_arrays
+
+    return load_arrays(path)
+
+
+def load_sweep(name='mpi_sweep'):
+    path = data_path(name)
+    return _load_sweep(path, file_token(os.path.join(path, 'border_cube.npy')))
+
+
+@st.cache_resource(show_spinner=False)
+def _load_scenario_routes(path, token, coverage_path, coverage_token):
+    routes = pd.read_parquet(path)
+    border_codes, border_ids = pd.factorize(routes['BorderID'], sort=True)
+    arrays = {
+        'route_length_km': routes['route_length_km'].to_numpy(dtype=np.float64),
+        'population': routes['POP2020'].to_numpy(dtype=np.float64),
+        'weight': routes['weight'].to_numpy(dtype=np.float64),
+        'urban': clean_names(routes['Type']).str.lower().eq('urban').fillna(False).to_numpy(dtype=bool),
+        'border_codes': border_codes,
+        'border_ids': np.asarray(border_ids),
+    }
+    if coverage_path:
+        # Population captured by each route's market at every candidate catchment radius
+        curves = pd.read_csv(coverage_path).pivot_table(index='MARKETID', columns='radius', values='population')
+        arrays['radii'] = curves.columns.to_numpy(dtype=np.float64)
+        arrays['coverage'] = curves.reindex(routes['MARKETID']).to_numpy(dtype=np.float64)
+    for array in arrays.values():
+        array.setflags(write=False)
+    return arrays
+
+
+def load_scenario_routes(name='mpi_routes.parquet', coverage='coverage_curves.csv'):
+    """Read-only route arrays for the scenario calculator, shared by every session.
+
+    With coverage curves from `pipeline.py --coverage-radii`, `coverage` holds
+    each route market's population per radius in `radii`.
+    """
+    path, coverage_path = data_path(name), data_path(coverage)
+    if not os.path.exists(coverage_path):
+        coverage_path = None
+    return _load_scenario_routes(path, file_token(path), coverage_path,
+                                 file_token(coverage_path) if coverage_path else None)
+
+
+@st.cache_resource(show_spinner=False)
+def _load_map_layers(path, token):
+    from map_layers import load_layers
+
+    return load_layers(path)
+
+
+def load_map_layers(name='map_layers'):
+    """Border, market, route and hexagon tables written by the pipeline's map stage."""
+    path = data_path(name)
+    return _load_map_layers(path, file_token(os.path.join(path, 'routes.parquet')))
+
+
+def has_dataset(name, marker=None):
+    return os.path.exists(data_path(os.path.join(name, marker) if marker else name))
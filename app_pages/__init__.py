@@ -0,0 +1,12 @@
+# One module per page, in sidebar order; the first is the landing page
+PAGES = [
+    ('overview.py', 'Project Overview', '🏠'),
+    ('conceptual_background.py', 'Conceptual Background', '📚'),
+    ('computational_framework.py', 'Computational Framework', '🛠️'),
+    ('data_methodology.py', 'Data and Methodology', '📈'),
+    ('exploration.py', 'Interactive Exploration', '🗺️'),
+    ('insights.py', 'Key Insights and Findings', '🧩'),
+    ('gis_modeling.py', 'GIS and Spatial Modeling', '🖼️'),
+    ('policy_reflections.py', 'Policy Reflections', '🏛️'),
+    ('resources.py', 'Resources and Downloads', '📚'),
+]
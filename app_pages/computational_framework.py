@@ -0,0 +1,96 @@
+import streamlit as st
+
+st.title("🧮 Step 2: Computational Model")
+# --- Summary Box ---
+st.info("""
+    **Summary:**  
+    Building on theoretical foundations, the computational framework translates spatial, temporal, and relational dynamics into measurable indices:
+    - **Spatial Layer (MPI):** Economic accessibility shaped by population, infrastructure, and distance decay.
+    - **Temporal Layer (CI):** Conflict exposure affecting trade disruption across time and space.
+    - **Relational Layer:** Ethnic and linguistic networks mediating borderland resilience and trade patterns.
+    """)
+st.markdown("---")
+# --- Row 1: Introduction + Optional Diagram ---
+row1_col1, row1_col2 = st.columns([2, 1])
+with row1_col1:
+    st.markdown("""
+    Building on the theoretical foundations outlined earlier, this section constructs the computational framework into three quantifiable components: the Market Potential Index (MPI), the Conflict Exposure Index (CI), and relational analysis.  
+    Together, these components provide a structured framework for analyzing borderland dynamics systematically and scalably.
+
+    - **Layer 1: Spatial Level**  
+    The MPI quantifies how geographic factors such as distance, infrastructure, and population size influence trade accessibility. High-resolution datasets from WorldPop and OpenStreetMap form the backbone, incorporating conditional buffering to distinguish urban and rural markets. An exponential distance-decay function, paired with sensitivity analysis across multiple decay parameters, models how economic flows diminish over distance.
+
+    - **Layer 2: Temporal Level**  
+    The CI captures how conflict events disrupt economic activities by weighting incidents by severity and proximity to trade corridors. This dynamic index allows for analyzing conflict's cumulative and evolving effects over time, revealing how insecurity embeds itself into borderland economies.
+
+    - **Layer 3: Relational Level**  
+    Recognizing that borders are also socially and culturally embedded spaces, the relational layer overlays ethnic and linguistic geographies onto MPI and CI outcomes. Using GREG data, it investigates how cultural networks shape resilience and trade flows in ways invisible to purely spatial or conflict-only models.
+
+    This three-layered design seeks to reveal the complex interplay of markets, security, and social trust that characterizes dynamic borderlands like Kenya–Uganda.
+    """, unsafe_allow_html=True)
+with row1_col2:
+    try:
+        st.image("pictures/framework_diagram.png", width='stretch')
+        st.caption("**Framework:** Translating Spatial, Temporal, and Relational Dimensions into Computable Indices")
+    except Exception:
+        st.warning("Framework diagram not found. Please ensure 'framework_diagram.png' exists in your project folder.")
+        st.markdown("**Framework:** Translating Spatial, Temporal, and Relational Dimensions into Computable Indices\n*Image not found*")
+st.markdown("---")
+# --- Row 2: Three Expanders in Columns ---
+row2_col1, row2_col2, row2_col3 = st.columns(3)
+# Layer 1: Spatial (MPI)
+with row2_col1:
+    with st.expander("🌐 Layer 1: Spatial Level (Market Potential Index - MPI)", expanded=False):
+        st.markdown("""
+    **Data Sources:**
+    - Population grids (WorldPop)
+    - Route networks (OpenStreetMap)
+    - Market and border post identifiers
+    - Conditional buffering: 1.5 km (urban) and 3 km (rural)
+
+    **MPI Formula:**
+    Weighted sum of surrounding population, decayed exponentially by travel distance.
+
+    **Decay Parameters:**
+    - Low decay (j=0.02): Long-range influence
+    - Medium decay (j=0.03): Balanced reach
+    - High decay (j=0.05): Localized impact
+
+    **Purpose:**
+    To map areas where infrastructure investment would generate the highest market activity under different distance sensitivities.
+            """, unsafe_allow_html=True)
+# Layer 2: Temporal (CI)
+with row2_col2:
+    with st.expander("⏳ Layer 2: Temporal Level (Conflict Exposure Index - CI)", expanded=False):
+        st.markdown("""
+    **Data Sources:**
+    - ACLED conflict events database (event counts, fatalities)
+    - Geospatial distances to trade routes
+    - Border and market identifiers
+
+    **CI Formula:**
+    Severity-weighted conflict events within proximity bands to trade routes.
+
+    **Temporal Aggregation:**
+    Annual mapping of conflict intensity, detecting spikes or chronic instability.
+
+    **Purpose:**
+    Quantify how insecurity accumulates and disrupts economic flows across space and time.
+            """, unsafe_allow_html=True)
+# Layer 3: Relational (Social Networks)
+with row2_col3:
+    with st.expander("🤝 Layer 3: Relational Level (Ethnic and Linguistic Networks)", expanded=False):
+        st.markdown("""
+    **Data Sources:**
+    - GREG ethnic geographies
+    - Language family overlays
+    - Spatial join with MPI and CI outcomes
+
+    **Analytical Steps:**
+    - Map intersection of ethnicity/language with trade potential and conflict exposure.
+    - Identify where cultural ties enhance trade or resilience.
+
+    **Purpose:**
+    Reveal how shared identities mediate both economic opportunity and vulnerability, offering critical policy insights invisible to spatial or conflict-only models.
+            """, unsafe_allow_html=True)
+st.markdown("---")
@@ -0,0 +1,79 @@
+import streamlit as st
+
+# Page Title
+st.title("🧠 Conceptual Background")
+# Summary Box
+st.info("""
+    **Summary:**  
+    This project introduces a computational framework for analyzing borderland dynamics, integrating spatial, temporal, and relational perspectives.  
+    It builds on spatial interaction theory, conflict studies, and relational geography to quantify market potential, conflict exposure, and social ties in dynamic border zones.
+    """)
+st.markdown("---")
+# === Row 1: Introduction + Framework Image ===
+row1_col1, row1_col2 = st.columns([2, 1])
+with row1_col1:
+    st.markdown("""
+    Traditional border studies have largely relied on qualitative assessments and isolated case studies, providing valuable but fragmented insights into how borders operate as zones of economic exchange, conflict, and social interaction.  
+    This perspective is evident in the evolution of border studies, transitioning from viewing borders as static lines to dynamic systems shaped by economic, social, and cultural exchanges.  
+    While qualitative richness has dominated, the lack of quantitative frameworks has limited our ability to systematically capture borderland dynamics.
+
+    This project builds upon the work of Eberhard-Ruiz, who measured conflict exposure at the border-post level along the Uganda–DRC frontier.  
+    Expanding beyond static analysis, we introduce a computational framework that integrates spatial and temporal layers, offering scalable, systematic methods to quantify economic and conflict realities at borders.
+
+    The framework combines spatial interaction theory, New Economic Geography, and conflict studies, operating across:
+    - **Spatial Layer:** Infrastructure, distance, and market potential (MPI)
+    - **Temporal Layer:** Conflict evolution and economic disruption (CI)
+    - **Relational Layer:** Social networks and informal trade
+
+    The Kenya–Uganda border serves as a validation case, with approximately 23,000 crossings daily along a volatile, opportunity-rich frontier.
+        """, unsafe_allow_html=True)
+with row1_col2:
+    try:
+        st.image("pictures/framework_diagram.png", width='stretch')
+        st.caption("**Figure:** Conceptual Framework Linking Spatial, Temporal, and Relational Layers.")
+    except Exception:
+        st.warning("Framework diagram not found. Please ensure 'framework_diagram.png' exists in your project folder.")
+        st.markdown("**Figure:** Conceptual Framework Linking Spatial, Temporal, and Relational Layers.\n*Image not found*")
+st.markdown("---")
+# === Row 2: 3 Columns for Levels inside Expanders ===
+row2_col1, row2_col2, row2_col3 = st.columns(3)
+with row2_col1:
+    with st.expander("🌍 Spatial Level: Infrastructure and Economic Geography", expanded=False):
+        st.markdown("""
+    **Infrastructure and Economic Geography**
+
+    Spatial interaction theory provides a basis for understanding how economic activities flow between locations, following a gravity-like principle: larger and closer locations interact more.
+
+    - **Location Characteristics:** Population size and economic activity drive interactions. Busia and Malaba, for example, act as economic anchors.
+    - **Transferability:** Infrastructure networks like roads and railways enhance movement and trade, transforming key crossings into hubs.
+    - **Distance Decay:** Economic interactions diminish with distance. Sensitivity analysis (j=0.02, 0.03, 0.05) tests how trade flows respond to distance variations.
+
+    While these spatial components are crucial, they alone cannot capture the disruptions caused by political instability and conflict, which leads to integrating a temporal dimension.
+            """, unsafe_allow_html=True)
+with row2_col2:
+    with st.expander("⏳ Temporal Level: Conflict Dynamics and Evolution", expanded=False):
+        st.markdown("""
+    **Conflict Dynamics and Evolution**
+
+    Protracted Social Conflict (PSC) theory explains how conflicts embed themselves into social systems, becoming self-sustaining through feedback loops.
+
+    - **Conflict Cycles:** Environmental stresses (e.g., droughts) and resource competition trigger cycles of violence, such as livestock raiding in the ASALs.
+    - **Economic Ripple Effects:** Conflicts near trade routes (like Busia) increase transport costs and deter investment.
+    - **Conflict Exposure Index (CI):** Aggregates conflict incidents using weighted severity and proximity to trade hubs, capturing both intensity and economic disruption potential.
+
+    This temporal analysis complements spatial measures, highlighting how persistent insecurity reshapes borderland economies over time.
+            """, unsafe_allow_html=True)
+with row2_col3:
+    with st.expander("🤝 Relational Level: Social Networks and Cultural Connections", expanded=False):
+        st.markdown("""
+    **Social Networks and Cultural Connections**
+
+    Relational space theory adds a social and cultural lens to border dynamics, focusing on localized ties across artificial boundaries.
+
+    - **Kinship and Language:** Shared ethnicity and languages (e.g., Luhya, Kiswahili) enable trust, trade, and resilience.
+    - **Mutual Intelligibility Zones:** Linguistic connections ease navigation across regulatory and social divides.
+    - **Conflict Mitigation:** Customary conflict resolution mechanisms embedded within kinship networks help de-escalate tensions and maintain trade during insecurity.
+
+    This relational layer shows how trust networks can either reinforce or bypass formal spatial and political structures.
+            """, unsafe_allow_html=True)
+st.markdown("---")
@@ -0,0 +1,81 @@
+import streamlit as st
+
+st.title("📈 Data and Methodology")
+st.header("🗂️ Data Sources")
+st.markdown("""
+    This section provides technical transparency about the data and methods used in our analysis.
+    """)
+with st.expander("Data Sources", expanded=False):
+    st.markdown("""
+        **Primary Data Sources:**
+        
+        - **WorldPop:** High-resolution population grids
+        - **OpenStreetMap:** Road networks and infrastructure
+        - **ACLED:** Geocoded conflict incident data
+        - **Ethnologue:** Ethnolinguistic mapping
+        
+        These datasets provide the foundation for our computational framework.
+        """)
+st.header("🧮 Methodology Overview")
+with st.expander("GIS Processing Steps", expanded=False):
+    st.markdown("""
+        **Key Processing Steps:**
+        
+        1. **Market Buffering:** 
+           - Urban markets: 1.5km radius
+           - Rural settlements: 3km radius
+        
+        2. **Conflict Aggregation:**
+           - 20km buffer around each border point
+           - Weighted by severity and proximity
+        
+        3. **Population Integration:**
+           - Grid cells aggregated to border points
+           - Distance decay applied
+        
+        4. **Social Network Mapping:**
+           - Ethnolinguistic regions identified
+           - Cross-border connections mapped
+        """)
+with st.expander("Parameters and Sensitivity", expanded=False):
+    st.markdown("""
+        **Default Parameters:**
+        
+        - **MPI Decay Rates:** j = 0.02, 0.03, 0.05
+        - **CI Buffer:** 20km
+        - **Conflict Weights:** Based on ACLED event types
+        
+        These parameters were chosen based on sensitivity analysis and can be adjusted in the interactive visualization.
+        """)
+st.header("🔁 Reproducibility")
+with st.expander("Code and Reproducibility", expanded=False):
+    st.markdown("""
+        **GitHub Repository:**
+        
+        All code is available in our public repository: [Computational Framework for Borderland Analysis](https://github.com/monyas96/Computational-Framework-for-Borderland-Analysis)
+        
+        The repository includes:
+        
+        - Python scripts for data processing
+        - R code for statistical analysis
+        - GIS workflows
+        - Documentation
+        
+        This ensures full reproducibility of our analysis.
+        """)
+with st.expander("Assumptions and Limitations", expanded=False):
+    st.markdown("""
+        **Key Assumptions:**
+        
+        - Population distribution is relatively stable over the study period
+        - Road networks are the primary means of transportation
+        - Conflict events are accurately geocoded
+        
+        **Limitations:**
+        
+        - Data quality varies across regions
+        - Some informal trade routes may not be captured
+        - Social networks are simplified in the model
+        
+        These limitations should be considered when interpreting the results.
+        """)
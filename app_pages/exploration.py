@@ -0,0 +1,429 @@
+import altair as alt
+import time
+from functools import partial
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+import streamlit as st
+
+from app_data import (BUNDLE_NAME, DOWNLOAD_FORMATS, STATIC_DOWNLOAD_BYTES, available_downloads, bundle_bytes, ci_matrix,
+                      download_bytes, download_size, has_dataset, load_cube, load_map_layers, load_scenario_routes,
+                      load_sweep, load_table, static_bundle, static_download)
+from ci import cumulative, rolling_sum
+from map_layers import colour_ramp
+from mpi import BUFFER_DISTANCE, DECAY_PARAMS, scenario_mpi
+
+# The decays of the pipeline's Norm_MPI_* columns and uncertainty bands
+DECAY_OPTIONS = DECAY_PARAMS
+
+
+def border_options(mpi_border):
+    return list(mpi_border['Border_Name'].dropna().unique())
+
+
+def border_labels(names, border_ids):
+    # Some posts share a name (Malaba, Kisumu, Busia), so the ID is kept in the label
+    return pd.Series(names, dtype=str).to_numpy() + ' (' + pd.Series(border_ids).astype(str).to_numpy() + ')'
+
+
+def heatmap(data, x, y, value, title, domain=None):
+    """Annotated heatmap of a long-form table, drawn by the browser with the YlGnBu scheme."""
+    scale = alt.Scale(scheme='yellowgreenblue', domain=domain) if domain else alt.Scale(scheme='yellowgreenblue')
+    base = alt.Chart(data).encode(x=alt.X(x, title=None), y=alt.Y(y, title=None, sort=None))
+    cells = base.mark_rect().encode(color=alt.Color(f'{value}:Q', title=title, scale=scale),
+                                    tooltip=[x.split(':')[0], y.split(':')[0], alt.Tooltip(f'{value}:Q', format='.2f')])
+    # Dark text on light cells, white on dark ones
+    threshold = (domain[1] if domain else data[value].max()) / 2
+    labels = base.mark_text(fontSize=11).encode(
+        text=alt.Text(f'{value}:Q', format='.2f'),
+        color=alt.condition(alt.datum[value] > threshold, alt.value('white'), alt.value('#22223b'))
+    )
+    return (cells + labels).properties(height=max(300, 28 * data[y.split(':')[0]].nunique()))
+
+
+def map_records(positions, values, names, label, colours=None, fmt='{:,.3f}'):
+    """Only what the map draws and its tooltip shows, with coordinates rounded to about 1 m."""
+    values = np.asarray(values, dtype=np.float64)
+    colours = colour_ramp(values) if colours is None else colours
+    return pd.DataFrame({
+        **{key: np.round(xy, 5).tolist() for key, xy in positions.items()},
+        'color': colours.tolist(),
+        'name': np.asarray(names, dtype=object),
+        'label': label,
+        'value': [fmt.format(v) if v == v else 'n/a' for v in values],
+    })
+
+
+def map_deck(layers, metric, decay, shown):
+    """Border posts, markets and route arcs coloured by MPI or CI, over population hexagons."""
+    borders, markets, routes = layers['borders'], layers['markets'], layers['routes']
+    value = 'CI' if metric == 'CI' else f'Norm_MPI_{decay}'
+    label = 'CI (all years)' if metric == 'CI' else f'MPI (decay {decay})'
+    deck_layers = []
+    if 'Population' in shown and 'hexes' in layers:
+        hexes = layers['hexes']
+        colours = np.column_stack([colour_ramp(hexes['population']), np.full(len(hexes), 150, np.uint8)])
+        records = map_records({'position': hexes[['Longitude', 'Latitude']].to_numpy()}, hexes['population'],
+                              ['Population'] * len(hexes), 'Population', colours, fmt='{:,.0f}')
+        # The tallest column is 40 km high
+        records['elevation'] = (hexes['population'] * 40_000 / max(hexes['population'].max(), 1)).round().to_numpy()
+        deck_layers.append(pdk.Layer(
+            'ColumnLayer', records, id='hexes', get_position='position', get_fill_color='color',
+            get_elevation='elevation', disk_resolution=6, radius=float(hexes['radius_m'].mean()), coverage=0.95,
+            extruded=True, pickable=True,
+        ))
+    if 'Routes' in shown:
+        deck_layers.append(pdk.Layer(
+            'ArcLayer', map_records({'source': routes[['Longitude_market', 'Latitude_market']].to_numpy(),
+                                     'target': routes[['Longitude_border', 'Latitude_border']].to_numpy()},
+                                    routes[value], routes['Name_of_Market'] + ' → ' + routes['Border_Name'], label),
+            id='routes', get_source_position='source', get_target_position='target', get_source_color='color',
+            get_target_color='color', get_width=2, pickable=True,
+        ))
+    if 'Markets' in shown:
+        # Markets outside the MAIN routes have no MPI and are drawn grey
+        records = map_records({'position': markets[['Longitude', 'Latitude']].to_numpy()}, markets[f'Norm_MPI_{decay}'],
+                              markets['Name_of_Market'], f'MPI (decay {decay})')
+        records['radius'] = np.clip(10 * np.sqrt(markets['POP2020'].fillna(0).to_numpy()), 1500, 8000).round()
+        deck_layers.append(pdk.Layer(
+            'ScatterplotLayer', records, id='markets', get_position='position', get_fill_color='color',
+            get_radius='radius', stroked=True, get_line_color=[60, 60, 60], line_width_min_pixels=1, pickable=True,
+        ))
+    if 'Border posts' in shown:
+        deck_layers.append(pdk.Layer(
+            'ScatterplotLayer', map_records({'position': borders[['Longitude', 'Latitude']].to_numpy()},
+                                            borders[value], borders['Border_Name'], label),
+            id='borders', get_position='position', get_fill_color='color', get_radius=9000, stroked=True,
+            get_line_color=[230, 57, 70], line_width_min_pixels=2, pickable=True,
+        ))
+    view = pdk.ViewState(longitude=float(borders['Longitude'].mean()), latitude=float(borders['Latitude'].mean()),
+                         zoom=6, pitch=40 if 'Population' in shown else 0)
+    return pdk.Deck(layers=deck_layers, initial_view_state=view, map_style=None,
+                    tooltip={'html': '<b>{name}</b><br/>{label}: {value}'})
+
+
+# Each chart tab is a fragment: changing one of its widgets reruns only that chart
+
+# --- Tab 1: MPI Bar Chart ---
+@st.fragment
+def mpi_bar_chart(mpi_border, mpi_bands):
+    st.subheader('Market Potential Index (MPI) by Border Post')
+    selected_borders = st.multiselect('Select Border(s)', border_options(mpi_border),
+                                      default=border_options(mpi_border))
+    decay_cols = [f'Norm_MPI_{j}' for j in DECAY_OPTIONS]
+    data = mpi_border[mpi_border['Border_Name'].isin(selected_borders)]
+    show_bands = mpi_bands is not None and st.checkbox('Show 95% uncertainty bands', value=True, key='mpi_bands')
+    if not data.empty:
+        # Melt the dataframe for Altair stacking
+        data = data.assign(Border=border_labels(data['Border_Name'], data['BorderID']))
+        data_melted = data.melt(id_vars=['Border'], value_vars=decay_cols, var_name='Decay', value_name='MPI')
+        data_melted['Decay'] = data_melted['Decay'].str.replace('Norm_MPI_', 'Decay=')
+        bars = alt.Chart(data_melted).mark_bar()
+        encoding = dict(
+            x=alt.X('Border:N', title='Border Name', sort=None),
+            y=alt.Y('MPI:Q', title='Market Potential Index', scale=alt.Scale(domain=[0, 1])),
+            color=alt.Color('Decay:N', title='Decay Parameter'),
+            tooltip=['Border', 'Decay', 'MPI']
+        )
+        if show_bands:
+            # Bars are grouped rather than stacked so each one can carry its own error bar
+            bands = mpi_bands[mpi_bands['Border_Name'].isin(selected_borders) & mpi_bands['decay'].isin(DECAY_OPTIONS)]
+            bands = bands.assign(Decay='Decay=' + bands['decay'].astype(str),
+                                 Border=border_labels(bands['Border_Name'], bands['BorderID']))
+            errorbars = alt.Chart(bands).mark_errorbar(ticks=True).encode(
+                x=alt.X('Border:N', sort=None),
+                xOffset='Decay:N',
+                y='MPI_low:Q',
+                y2='MPI_high:Q',
+                tooltip=['Border', 'Decay', 'MPI_low', 'MPI_median', 'MPI_high']
+            )
+            chart = alt.layer(bars.encode(xOffset='Decay:N', **encoding), errorbars)
+        else:
+            chart = bars.encode(**encoding)
+        st.altair_chart(chart.properties(height=400), width='stretch')
+    else:
+        st.info('No data for selected borders.')
+
+
+# --- Tab 2: MPI Heatmap ---
+@st.fragment
+def mpi_heatmap(mpi_border):
+    st.subheader('MPI Heatmap by Border Post')
+    decay = st.selectbox('Decay Parameter', DECAY_OPTIONS, key='heatmap_decay')
+    data = pd.DataFrame({'Border': border_labels(mpi_border['Border_Name'], mpi_border['BorderID']),
+                         'MPI': mpi_border[f'Norm_MPI_{decay}'].to_numpy(), 'Decay': f'Decay {decay}'})
+    chart = heatmap(data, 'Decay:N', 'Border:N', 'MPI', f'MPI (Decay {decay})', domain=[0, 1])
+    st.altair_chart(chart.properties(title=f'MPI Heatmap (Decay {decay})'), width='stretch')
+
+
+# --- MPI Decay Sensitivity (precomputed sweep, memory-mapped) ---
+@st.fragment
+def mpi_decay_sensitivity(mpi_border):
+    st.subheader('MPI Sensitivity to the Decay Parameter')
+    if has_dataset('mpi_sweep', 'border_cube.npy'):
+        sweep = load_sweep()
+        names = mpi_border.set_index('BorderID')['Border_Name']
+        selected_borders = st.multiselect('Select Border(s)', border_options(mpi_border), default=border_options(mpi_border), key='sweep_borders')
+        rows = [i for i, b in enumerate(sweep['border_ids']) if b in names.index and names[b] in selected_borders]
+        if rows:
+            cube = np.asarray(sweep['border_cube'][rows])
+            data = pd.DataFrame({
+                'BorderID': np.repeat(sweep['border_ids'][rows], cube.shape[1]),
+                'Decay': np.tile(sweep['decays'], len(rows)),
+                'MPI': cube.ravel(),
+            })
+            data['Border_Name'] = data['BorderID'].map(names)
+            chart = alt.Chart(data).mark_line().encode(
+                x=alt.X('Decay:Q', title='Decay Parameter (j)'),
+                y=alt.Y('MPI:Q', title='Market Potential Index', scale=alt.Scale(domain=[0, 1])),
+                color=alt.Color('Border_Name:N', title='Border Name'),
+                detail='BorderID:N',
+                tooltip=['Border_Name', 'BorderID', 'Decay', 'MPI']
+            ).properties(height=400)
+            st.altair_chart(chart, width='stretch')
+        else:
+            st.info('No data for selected borders.')
+    else:
+        st.info('Run `python mpi.py` to generate the decay sweep (data/mpi_sweep).')
+
+
+def coverage_population(routes, radii, urban_radius, rural_radius):
+    """Population of each route's market at the urban or rural catchment radius."""
+    return np.where(routes['urban'], routes['coverage'][:, radii.index(urban_radius)],
+                    routes['coverage'][:, radii.index(rural_radius)])
+
+
+# --- MPI Scenarios: border MPI recomputed live from the shared route arrays ---
+@st.fragment
+def mpi_scenarios(mpi_border):
+    st.subheader('MPI Scenarios')
+    st.markdown('Change the decay, market populations or open border posts and the border-level MPI is recomputed '
+                'from every route.')
+    routes = load_scenario_routes()
+    names = mpi_border.drop_duplicates('BorderID').set_index('BorderID')['Border_Name']
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        decay = st.slider('Decay Parameter (j)', 0.001, 0.2, 0.03, step=0.001, format='%.3f', key='scenario_decay')
+        blocked = st.multiselect('Closed border posts', list(names.index), key='scenario_blocked',
+                                 format_func=lambda b: f'{names[b]} ({b})')
+    # Min-max normalisation cancels a uniform scaling, so urban and rural markets are scaled separately
+    with col2:
+        urban_scale = st.slider('Urban market population (x)', 0.25, 4.0, 1.0, step=0.05, key='scenario_urban')
+        rural_scale = st.slider('Rural market population (x)', 0.25, 4.0, 1.0, step=0.05, key='scenario_rural')
+    with col3:
+        if 'coverage' in routes:
+            radii = list(routes['radii'])
+            # Start from the pipeline's buffers, or the nearest radius the coverage curves have
+            urban_default, rural_default = (min(radii, key=lambda r: abs(r - BUFFER_DISTANCE[kind]))
+                                            for kind in ('urban', 'rural'))
+            urban_radius = st.select_slider('Urban catchment radius (m)', radii, value=urban_default,
+                                            key='scenario_urban_radius')
+            rural_radius = st.select_slider('Rural catchment radius (m)', radii, value=rural_default,
+                                            key='scenario_rural_radius')
+        else:
+            st.caption('Run `pipeline.py --population ... --coverage-radii ...` and copy `coverage_curves.csv` '
+                       'to data/ to vary the urban/rural catchment radius.')
+
+    start = time.perf_counter()
+    baseline_population = population = routes['population']
+    if 'coverage' in routes:
+        # The baseline uses the same coverage curves at the default radii, so Change is zero there
+        baseline_population = coverage_population(routes, radii, urban_default, rural_default)
+        population = coverage_population(routes, radii, urban_radius, rural_radius)
+    population = population * np.where(routes['urban'], urban_scale, rural_scale)
+    keep = ~np.isin(routes['border_ids'][routes['border_codes']], blocked) if blocked else None
+    n_borders = len(routes['border_ids'])
+    scenario = scenario_mpi(routes['route_length_km'], population, routes['weight'], routes['border_codes'], n_borders,
+                            decay, keep)
+    baseline = scenario_mpi(routes['route_length_km'], baseline_population, routes['weight'], routes['border_codes'],
+                            n_borders, decay)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    results = pd.DataFrame({'BorderID': routes['border_ids'], 'Baseline': baseline, 'Scenario': scenario})
+    results = results[results['BorderID'].isin(names.index)]
+    results.insert(1, 'Border_Name', border_labels(results['BorderID'].map(names), results['BorderID']))
+    results['Change'] = results['Scenario'] - results['Baseline']
+    data = results.melt(id_vars=['Border_Name'], value_vars=['Baseline', 'Scenario'], var_name='Run', value_name='MPI')
+    chart = alt.Chart(data).mark_bar().encode(
+        x=alt.X('Border_Name:N', title='Border Name', sort=None),
+        xOffset='Run:N',
+        y=alt.Y('MPI:Q', title='Market Potential Index', scale=alt.Scale(domain=[0, 1])),
+        color=alt.Color('Run:N', title=None),
+        tooltip=['Border_Name', 'Run', alt.Tooltip('MPI:Q', format='.3f')]
+    ).properties(height=400)
+    st.altair_chart(chart, width='stretch')
+    st.dataframe(results.drop(columns='BorderID'), hide_index=True, width='stretch',
+                 column_config={col: st.column_config.NumberColumn(format='%.3f')
+                                for col in ['Baseline', 'Scenario', 'Change']})
+    radii_note = (f', catchment radii {urban_default:,.0f} m urban and {rural_default:,.0f} m rural'
+                  if 'coverage' in routes else '')
+    st.caption(f'Baseline: decay {decay:.3f}, unscaled populations{radii_note}, every border post open. '
+               f'Recomputed over {len(routes["weight"]):,} distinct routes in {elapsed_ms:.1f} ms.')
+
+
+# --- Tab 3: CI Temporal Trends ---
+@st.fragment
+def ci_temporal_trends(mpi_border, ci_cube_dirs, ci_bands):
+    st.subheader('Temporal Trends in Conflict Exposure Index (CI)')
+    selected_borders = st.multiselect('Select Border(s)', border_options(mpi_border), default=border_options(mpi_border), key='ci_line_borders')
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        resolution = st.selectbox('Resolution', list(ci_cube_dirs), key='ci_resolution')
+    cube = load_cube(ci_cube_dirs[resolution])
+    with col2:
+        view = st.radio('View', ['Per period', 'Rolling window', 'Cumulative'], horizontal=True, key='ci_view')
+    with col3:
+        # One widget per resolution, so a weekly window is never checked against the annual maximum
+        window = st.number_input('Window (periods)', min_value=1, max_value=len(cube['bins']), value=min(3, len(cube['bins'])),
+                                 key=f'ci_window_{resolution}', disabled=view != 'Rolling window')
+    rows = np.flatnonzero(np.isin(cube['border_names'], selected_borders))
+    if len(rows):
+        bins = cube['bins']
+        if view == 'Rolling window':
+            values = rolling_sum(cube['prefix'][rows], window)
+            bins = bins[window - 1:]
+        elif view == 'Cumulative':
+            values = cumulative(cube['prefix'][rows])
+        else:
+            values = np.asarray(cube['cube'][rows])
+        data = pd.DataFrame({
+            'Border_Name': np.repeat(cube['border_names'][rows], len(bins)),
+            'BorderID': np.repeat(cube['border_ids'][rows], len(bins)),
+            'period': np.tile(bins, len(rows)),
+            'CI': values.ravel(),
+        })
+        chart = alt.Chart(data).mark_line(point=True).encode(
+            x=alt.X('period:O', title={'Annual': 'Year', 'Monthly': 'Month', 'Weekly': 'Week'}[resolution]),
+            y=alt.Y('CI:Q', title='Conflict Exposure Index' if resolution == 'Annual' else 'Event Exposure'),
+            color='Border_Name:N',
+            detail='BorderID:N',
+            tooltip=['Border_Name', 'BorderID', 'period', 'CI']
+        )
+        # Bands are per year, so they only apply to the annual per-period view
+        if ci_bands is not None and resolution == 'Annual' and view == 'Per period':
+            bands = ci_bands[ci_bands['BorderID'].isin(cube['border_ids'][rows])]
+            bands = bands.assign(period=bands['year'].astype(str))
+            chart = chart + alt.Chart(bands).mark_errorbar(ticks=True).encode(
+                x='period:O',
+                y='CI_low:Q',
+                y2='CI_high:Q',
+                color='Border_Name:N',
+                detail='BorderID:N',
+                tooltip=['Border_Name', 'BorderID', 'period', 'CI_low', 'CI_median', 'CI_high']
+            )
+        st.altair_chart(chart.properties(height=400), width='stretch')
+        if resolution != 'Annual':
+            st.caption('Monthly and weekly values are event exposure, not the annual route-based CI: each ACLED event '
+                       'near a border post (20 km by default) weighted by fatalities + 0.5 and decayed with distance '
+                       '(`pipeline.py --events`). Compare them with each other, not with the annual CI.')
+    else:
+        st.info('No CI data for selected borders.')
+
+
+# --- Map: border posts, markets, route arcs and population hexagons ---
+@st.fragment
+def border_map(layers):
+    st.subheader('Border Posts, Markets and Trade Routes')
+    col1, col2, col3 = st.columns([1, 1, 2])
+    with col1:
+        metric = st.radio('Colour by', ['MPI', 'CI'], horizontal=True, key='map_metric')
+    with col2:
+        decay = st.selectbox('Decay Parameter', DECAY_OPTIONS, key='map_decay')
+    with col3:
+        shown = st.multiselect('Layers', ['Border posts', 'Markets', 'Routes', 'Population'],
+                               default=['Border posts', 'Markets', 'Routes', 'Population'], key='map_layers')
+    st.pydeck_chart(map_deck(layers, metric, decay, shown), width='stretch')
+    st.caption('Markets are coloured by their MPI. Population hexagons sum the population points (or market '
+               'populations) that fall inside them; their height and colour scale with the total.')
+
+
+# --- Tab 4: CI Heatmap ---
+@st.fragment
+def ci_heatmap(ci_cube_dirs):
+    st.subheader('CI Heatmap by Border and Year')
+    chart = heatmap(ci_matrix(ci_cube_dirs['Annual']), 'year:O', 'Border_Name:N', 'CI', 'CI Value')
+    st.altair_chart(chart.properties(title='Conflict Exposure Index (CI) by Border and Year'), width='stretch')
+
+
+# --- Tab 5: Download Data ---
+@st.fragment
+def downloads():
+    st.subheader('📥 Download Data')
+    tables = available_downloads()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        name = st.selectbox('Table', list(tables), format_func=tables.get, key='download_table')
+    with col2:
+        fmt_label = st.radio('Format', list(DOWNLOAD_FORMATS), horizontal=True, key='download_format')
+    fmt, mime = DOWNLOAD_FORMATS[fmt_label]
+    file_name = name.replace('.csv', f'.{fmt}')
+    size = download_size([name])
+    st.caption(f'{size / 1e6:.2f} MB as CSV')
+    # Payloads are built when the button is clicked, not on every rerun
+    if size > STATIC_DOWNLOAD_BYTES:
+        url = static_download(name, fmt)
+        if url is None:
+            st.warning(f'{tables[name]} is too large for the app to serve, even zipped. '
+                       f'Run the pipeline locally to get `{name}`.')
+        else:
+            zipped = ', zipped' if url.endswith('.zip') else ''
+            st.link_button(f'Download {tables[name]} ({fmt_label}{zipped})', url)
+    else:
+        st.download_button(f'Download {tables[name]} ({fmt_label})', data=partial(download_bytes, name, fmt),
+                           file_name=file_name, mime=mime, on_click='ignore', key='download_table_button')
+
+    total = download_size(tables)
+    label = f'Download all {len(tables)} tables (zip, {total / 1e6:.2f} MB of CSV)'
+    if total > STATIC_DOWNLOAD_BYTES:
+        url = static_bundle(list(tables))
+        if url is None:
+            st.warning('The tables together are too large for the app to serve as one zip; download them one by one.')
+        else:
+            st.link_button(label, url)
+    else:
+        st.download_button(label, data=partial(bundle_bytes, list(tables)), file_name=BUNDLE_NAME,
+                           mime='application/zip', on_click='ignore', key='download_bundle_button')
+
+
+st.title("🌍 Interactive Borderland Analysis")
+st.markdown("""
+    Explore the intersection of **Market Potential** and **Conflict Exposure** across the Kenya–Uganda border. This tool allows dynamic exploration of spatial, temporal, and relational trends shaping border dynamics.
+    """)
+# --- Load Data (parsed once per file version, shared across reruns and sessions) ---
+mpi_border = load_table('mpi_border_results.csv')
+# Monte Carlo percentile bands from `pipeline.py --replicates`, drawn as error bars when present
+mpi_bands = load_table('mpi_border_bands.csv')
+ci_bands = load_table('ci_bands.csv')
+tab1, tab2, tab_sweep, tab_scenarios, tab3, tab4, tab_map, tab5 = st.tabs([
+    'MPI Bar Chart', 'MPI Heatmap', 'MPI Decay Sensitivity', 'MPI Scenarios', 'CI Temporal Trends', 'CI Heatmap', 'Map',
+    'Download Data'
+])
+# --- CI cubes (border x time bin), memory-mapped; windows come from prefix sums ---
+ci_cube_dirs = {
+    label: name for label, name in [
+        ('Annual', 'ci_cube'), ('Monthly', 'ci_cube_monthly'), ('Weekly', 'ci_cube_weekly')
+    ] if has_dataset(name, 'prefix.npy')
+}
+with tab1:
+    mpi_bar_chart(mpi_border, mpi_bands)
+with tab2:
+    mpi_heatmap(mpi_border)
+with tab_sweep:
+    mpi_decay_sensitivity(mpi_border)
+with tab_scenarios:
+    if has_dataset('mpi_routes.parquet'):
+        mpi_scenarios(mpi_border)
+    else:
+        st.info('Run `python pipeline.py` and copy results/mpi/mpi_routes.parquet to data/ to enable scenarios.')
+with tab3:
+    ci_temporal_trends(mpi_border, ci_cube_dirs, ci_bands)
+with tab4:
+    ci_heatmap(ci_cube_dirs)
+with tab_map:
+    if has_dataset('map_layers', 'routes.parquet'):
+        border_map(load_map_layers())
+    else:
+        st.info('Run `python pipeline.py` and copy results/map/map_layers to data/ to build the map layers.')
+with tab5:
+    downloads()
@@ -0,0 +1,65 @@
+import os
+
+import streamlit as st
+
+from assets import ASSET_DIR, ASSET_MANIFEST, picture_html, prefetch_html, read_manifest
+
+
+@st.cache_data(show_spinner=False)
+def load_asset_manifest(mtime):
+    return read_manifest(ASSET_DIR)
+
+
+# Title and Introduction
+st.title("🛰️ GIS Analysis Workflow")
+st.markdown("""
+    Welcome to the **step-by-step walkthrough** of how the GIS analysis behind the Kenya–Uganda border study was constructed. 
+    This guide explains how datasets were processed, merged, and transformed into actionable spatial insights.
+    Use the **Next** and **Back** buttons to explore each step.
+    """)
+# Organized slides with correct pictures and text
+slides = [
+    ("pictures/Merge_datasets.png", "Merging Datasets", "We merged datasets of Uganda and Kenya to create a unified foundation for analyzing cross-border trade, conflict, and population patterns."),
+    ("pictures/markets with population density weight 1.png", "Population Assignment: Markets and Population", "We sourced high-resolution population data from WorldPop and assigned it to each market point."),
+    ("pictures/markets with population density weight 2.png", "Market Coverage Simulation", "Urban markets received a 1.5 km buffer; rural markets a 3 km buffer, simulating service areas realistically."),
+    ("pictures/Trading routes and Markets population coverage 1.png", "Trading Routes and Population Coverage (Part 1)", "Visualization showing how catchment areas relate to key trading routes."),
+    ("pictures/Trading routes and Markets population coverage 2.png", "Trading Routes and Population Coverage (Part 2)", "Highlights how clustered populations align with transport corridors."),
+    ("pictures/Travel Distance Calculation 1.png", "Travel Distance Calculation (Part 1)", "Using OSM data, we calculated travel distances from markets to border posts."),
+    ("pictures/Travel Distance Calculation 2.png", "Travel Distance Calculation (Part 2)", "This map visualizes how accessibility varies across the region."),
+    ("pictures/Road Data Preparation.png", "Road Data Preparation", "Road infrastructure was cleaned and validated to model realistic travel times."),
+    ("pictures/assign pop point to market 1.png", "Assigning Population Points to Markets (Part 1)", "Spatial joins linked buffered markets to surrounding population points."),
+    ("pictures/assign pop point to market 2.png", "Assigning Population Points to Markets (Part 2)", "This simulates realistic market demand by weighting markets by nearby population."),
+    ("pictures/fatalities and proximity1.png", "Conflict Event Proximity (Part 1)", "Conflict event data was analyzed for proximity to critical trade routes."),
+    ("pictures/fatalities and proximity2.png", "Conflict Event Proximity (Part 2)", "We weighted fatalities and conflict severity closer to borders more heavily."),
+    ("pictures/Travle distance (1).jpg", "Conflict Impact on Trade Routes", "Trade routes were assessed for risk exposure to nearby conflicts."),
+    ("pictures/Markets type and conflict (1).jpg", "Market Types and Conflict Exposure", "We examined how different market types faced different conflict risks."),
+    ("pictures/CI (1).jpg", "Conflict Intensity Mapping", "Conflict Intensity (CI) heatmaps and timelines highlight spikes in conflict at hubs like Busia and Malaba."),
+    ("pictures/Layer 3 .jpg", "Relational Networks (Ethnicity and Trade)", "We overlaid ethnic, cultural, and linguistic ties onto economic and conflict maps.")
+]
+# Initialize slide index
+if "slide_index" not in st.session_state:
+    st.session_state.slide_index = 0
+# Navigation Buttons
+col1, col2, col3 = st.columns([1, 4, 1])
+with col1:
+    if st.button("⬅️ Back"):
+        st.session_state.slide_index = max(st.session_state.slide_index - 1, 0)
+with col3:
+    if st.button("Next ➡️"):
+        st.session_state.slide_index = min(st.session_state.slide_index + 1, len(slides) - 1)
+# Display Current Slide: the browser picks a resized WebP/JPEG for its width and fetches the next slide ahead
+image_path, title, description = slides[st.session_state.slide_index]
+st.subheader(f"**{title}**")
+manifest_path = os.path.join(ASSET_DIR, ASSET_MANIFEST)
+assets = load_asset_manifest(os.path.getmtime(manifest_path)) if os.path.exists(manifest_path) else {}
+if image_path in assets:
+    html = picture_html(assets[image_path], title)
+    next_index = st.session_state.slide_index + 1
+    if next_index < len(slides) and slides[next_index][0] in assets:
+        html += prefetch_html(assets[slides[next_index][0]])
+    st.html(html)
+else:
+    st.image(image_path, width='stretch')
+st.markdown(f"**{description}**")
+# Optional Sidebar
+st.sidebar.markdown("🗺️ Navigate through the GIS Analysis Workflow step-by-step.")
@@ -0,0 +1,76 @@
+import streamlit as st
+
+st.title("📖 Applying the Computational Framework: Insights from the Kenya–Uganda Border")
+tab1, tab2, tab3, tab4, tab5 = st.tabs([
+    "Background",
+    "Spatial Analysis (MPI)",
+    "Temporal Analysis (CI)",
+    "Relational Analysis",
+    "Conclusion"
+])
+with tab1:
+    st.header("🧭 Background")
+    st.markdown("""
+        The Kenya–Uganda borderland reveals a stark duality: zones of economic vibrancy and zones of persistent insecurity.  
+        In the north, arid lands populated by pastoralist communities (e.g., Turkana and Karamoja) depend on cross-border mobility, yet climate change and insecurity have turned these flows into sources of tension. Scarce pasture and water resources fuel armed cattle raids, reinforcing cycles of violence.
+
+        In the south, towns like Busia, Malaba, and Lwakhakha anchor critical trade routes, linking Kenya, Uganda, Rwanda, South Sudan, and the DRC. Although relatively small in size, these hubs play an outsized role in regional commerce, catalyzed by infrastructure development and East African Community (EAC) integration efforts.
+
+        This diversity—from volatile pastoralist zones to booming trade corridors—demonstrates why understanding borderland dynamics requires an integrated approach spanning spatial, temporal, and relational dimensions.
+        """)
+with tab2:
+    st.header("🗺️ 3.1 Spatial Analysis and the Market Potential Index (MPI)")
+    st.markdown("""
+        The Market Potential Index (MPI) operationalizes spatial interaction theory, measuring how distance, infrastructure, and population size shape economic accessibility.
+
+        **Key Insights:**
+        - **Strategic Hubs:** Busia, Malaba, and Kisumu consistently exhibit the highest MPI scores, reflecting their infrastructural strength and location within major trade corridors.
+        - **Spatial Spread:** At low decay rates, economic influence from major hubs extends broadly. As decay increases, economic potential becomes more localized.
+        - **Peripheral Constraints:** Remote regions such as Kaabong and Amudat consistently score low, highlighting persistent barriers to economic integration.
+
+        **Interpretation:**
+        The findings validate core principles of spatial interaction theory: proximity and infrastructure drive economic flows.  
+        Importantly, sensitivity to decay parameters emphasizes a policy-relevant point: **distance elasticity matters**.  
+        Planners must account for how steeply economic opportunities fall off with distance when designing transport corridors and trade hubs.
+        """)
+with tab3:
+    st.header("🔥 3.2 Temporal Analysis and the Conflict Exposure Index (CI)")
+    st.markdown("""
+        The Conflict Exposure Index (CI) captures how recurrent insecurity shapes trade dynamics over time, aligning with protracted social conflict theory.
+
+        **Key Insights:**
+        - **Vulnerable Trade Nodes:** Busia and Kisumu show the highest and most volatile conflict exposure.
+        - **Temporal Volatility:** Conflict exposure is not static; critical trade hubs can experience sudden shocks.
+        - **Isolated Stability:** Border posts like Kaabong and Amudat remain insulated from conflict but economically marginalized.
+
+        **Interpretation:**
+        Spatial proximity amplifies conflict risk.  
+        High-value economic corridors are particularly vulnerable to security shocks, necessitating dynamic monitoring systems.  
+        Meanwhile, geographic isolation protects some regions at the cost of deeper marginalization.
+        """)
+with tab4:
+    st.header("🤝 3.3 Relational Layer: Social Networks and Cultural Connectivity")
+    st.markdown("""
+        The relational layer highlights how ethnic and linguistic networks mediate borderland interactions.
+
+        **Key Insights:**
+        - **Cultural Economies:** Cross-border trade thrives where linguistic and ethnic ties facilitate trust and reduce transaction costs.
+        - **Conflict Mediation:** Kinship networks in pastoralist regions can either stabilize or destabilize trade routes.
+        - **Spatial-Relational Dynamics:** Economic hubs often align with zones of strong cultural integration.
+
+        **Interpretation:**
+        Relational space is not a backdrop but an active force.  
+        Economic resilience and vulnerability cannot be explained solely by physical connectivity or conflict trends;  
+        they are deeply shaped by the human geographies of trust, kinship, and shared culture.
+        """)
+with tab5:
+    st.header("✨ Conclusion")
+    st.markdown("""
+        Applying the computational framework to the Kenya–Uganda border demonstrates that:
+
+        - **Economic opportunity and conflict vulnerability are spatially and temporally intertwined.**
+        - **Infrastructure and trade routes amplify both prosperity and exposure to risk.**
+        - **Cultural networks mediate these dynamics, enabling both resilience and fragility.**
+
+        Borderland development must therefore move beyond physical investment alone: it must recognize the **interlocking roles of geography, conflict patterns, and human relations** in shaping regional futures.
+        """)
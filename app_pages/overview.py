@@ -0,0 +1,133 @@
+import streamlit as st
+
+st.title("🏠 Borderland Dynamics Knowledge Hub")
+st.markdown("---")
+st.header("Project Overview")
+st.markdown("""
+    This knowledge hub emerges from my work as a Fellow with the **Women Researchers Fellowship**, part of the **X-Border Local Research Network** — an initiative that supports early-career female researchers working on conflict-affected border regions across Asia, the Middle East, and the Horn of Africa.
+    
+    During my fellowship, I set out to develop a computational framework that could better capture the economic, security, and social dynamics shaping borderland regions. Using the Kenya–Uganda border as a case study, I combined spatial modeling with relational analysis to map trade potential, conflict risk, and informal social networks.
+    
+    The goal was not simply to produce new indices or maps, but to make complex realities **legible**, **interpretable**, and **actionable** for policy audiences.  
+    This project reflects a growing recognition: **technical alone is not enough**. For computational research to shape real-world decisions, it must be framed around institutional questions, embedded within policy processes, and open to reflexive interpretation.
+     """)
+st.markdown("""
+    This Streamlit app provides a **unified platform** where users can explore the computational model interactively, read through the technical and reflexive findings, and engage with the broader **methodological conversation** around borderland research.
+
+The hub integrates **two core research outputs**:
+- **Computational Framework for Borderland Analysis**  
+  ➔ Technical modeling of trade potential, conflict risk, and relational networks.
+- **Borderlands, Evidence, and Methodological Pluralism**  
+  ➔ Reflexive supplement on how evidence is shaped, methodological choices, and institutional contexts.
+
+
+
+## 🛠️ How the Project Was Built
+
+""")
+with st.expander("🔎 Click here to expand the full technical and conceptual process"):
+    st.markdown("""
+The project unfolded in three interlinked layers:
+
+### 1. Theoretical Framing
+- Grounded in **borderland studies**, **relational geography**, and **fragility research**.
+- Recognized that **trust networks, identity ties, and informal economies** heavily shape cross-border trade.
+- Emphasized the **need for pluralistic evidence**—combining hard quantitative data with relational and cultural insight.
+
+(See 📚 *Conceptual Background* for detailed framing.)
+
+---
+
+### 2. Technical Spatial Analysis
+
+**Data Collection and Merging**  
+- Sources: WorldPop (population), ACLED (conflict), OpenStreetMap/Overpass Turbo (markets and roads), ESRI Africa Transport Routes.
+- Merged Kenya and Uganda datasets to create a unified spatial canvas.
+
+**Assigning Population to Markets**  
+- Created **buffers** around markets (1.5 km for urban, 3 km for rural).
+- Used **spatial joins** to estimate the population covered by each market.
+
+**Conflict Exposure Index (CI)**  
+- Modeled conflict risk as a function of **proximity** and **fatalities** near border posts.
+- Developed a weighted index where fatalities closer to a border post mattered more.
+
+**Market Potential Index (MPI)**  
+- Modeled trade potential by combining **population reach**, **road accessibility**, and **market distance**.
+- Used **travel time calculations** based on real road network data (max speed per road type).
+
+**Mapping Relational Ties**  
+- Overlaid **ethnic and linguistic group data** to model trust-based trading patterns across the border.
+- Highlighted how informal networks sometimes mattered more than formal infrastructure.
+
+---
+
+### 3. Reflection and Institutional Relevance
+
+**Key Lessons:**
+- Data and models **alone do not answer policy questions** — co-defining goals with policymakers is essential.
+- **Relational factors** (ethnicity, trust, informal ties) are crucial but often ignored in technical models.
+- Computational methods should be **reflexive**: transparent about assumptions and limitations.
+
+(See 🏛️ *Policy Reflections* for a deeper discussion.)
+
+---
+
+""")
+st.markdown("""
+---
+
+## 🧭 How to Navigate This Hub
+
+| Section | Purpose |
+|:--------|:--------|
+| 🏠 **Project Overview** | Big-picture framing: what, why, and how. |
+| 📚 **Conceptual Background** | Theories and frameworks that shaped the project. |
+| 🛠️ **Computational Framework** | Deep dive into modeling choices and assumptions. |
+| 📈 **Data and Methodology** | How the data was collected, processed, and modeled. |
+| 🌍 **Interactive Exploration** | Explore conflict risks, market potentials, and travel networks interactively. |
+| 🧩 **Key Insights and Findings** | Summarized key results and patterns. |
+| 🗺️ **GIS and Spatial Modeling** | Detailed walkthrough of the GIS analysis with diagrams and visual examples. |
+| 🏛️ **Policy Reflections** | Insights for making models actionable and usable for decision-making. |
+| 📚 **Resources and Downloads** | Access supplementary material and additional references. |
+
+---
+
+
+I invite you to explore, reflect, and rethink evidence in cross-border settings.
+
+""")
+st.markdown("---")
+
+# --- Source Papers Section ---
+st.subheader("Source Papers")
+col1, col2 = st.columns(2)
+with col1:
+    with st.expander("📄 Technical Paper: Computational Framework for Borderland Analysis", expanded=False):
+        st.markdown("""
+            This paper presents the technical foundation of our computational approach, including:
+            
+            - Market Potential Index (MPI) methodology
+            - Conflict Exposure Index (CI) calculation
+            - Relational network mapping techniques
+            
+            [Download Technical Paper (PDF)](https://your-link-here.com)
+            """)
+with col2:
+    with st.expander("📄 Supplementary Paper: Borderlands, Evidence, and Methodological Pluralism", expanded=False):
+        st.markdown("""
+            This paper reflects on the policy relevance of computational methods, exploring:
+            
+            - How to make complex borderland dynamics legible to policymakers
+            - The importance of framing research around specific institutional questions
+            - The role of reflexivity in evidence-based policy
+            
+            [Download Supplementary Paper (PDF)](https://your-link-here.com)
+            """)
+st.markdown("---")
+st.markdown("---")
+st.markdown(
+    """
+<footer>This report is a product of the FCDO's Cross-Border Conflict: Evidence, Policy and Trends (XCEPT) programme, funded by UK aid from the UK government. XCEPT brings together leading experts to examine conflict-affected borderlands, how conflicts connect across borders, and the factors that shape violent and peaceful behaviour. This research is a part of XCEPT's Local Research Network, which engages experts on the ground to build data, evidence and analysis that reflects the local experiences of fragility and conflict. For more information on XCEPT and the Local Research Network visit www.xcept-research.org. The views expressed in the document do not necessarily reflect those of XCEPT or the UK government.</footer>""",
+    unsafe_allow_html=True
+)
@@ -0,0 +1,71 @@
+import streamlit as st
+
+st.title("🏛️ Policy Reflections")
+# --- TL;DR Summary Box ---
+with st.container():
+    st.info("""
+        **Summary:**  
+        This research project modeled the intersection of trade and conflict along the Kenya–Uganda border.  
+        While computational methods provided powerful insights, the absence of co-defined policy questions limited immediate actionability.  
+        This reflection highlights the importance of early co-construction with policy actors, the added value of computational approaches in decision-making, and future directions for collaborative, reflexive research.
+        """)
+# --- 1. Study in Plain English ---
+st.header("1️⃣ What I Did: The Study in Plain English")
+with st.expander("Expand to read the study overview", expanded=False):
+    st.markdown("""
+        This project developed a computational spatial model to examine where economic opportunities and security risks overlap along the Kenya–Uganda border.  
+        It consisted of three main components:
+        
+        - **Market Potential Index (MPI):** Measured trade potential based on population, infrastructure, and distance.
+        - **Conflict Exposure Index (CI):** Measured security risks based on proximity and severity of conflict events.
+        - **Relational Layer:** Mapped ethnic, linguistic, and kinship ties that shape informal trade routes and resilience patterns.
+        
+        **Key findings included:**
+        - Busia and Malaba are high-reward, high-risk hubs: strong trade potential, but vulnerability to conflict.
+        - Kaabong and Amudat are stable but neglected: minimal conflict exposure but low investment attention.
+        - Social networks reroute trade flows: kinship ties often guide commerce beyond formal infrastructure.
+        
+        However, without a pre-agreed policy objective, translating these findings into actionable recommendations remained difficult.
+        """)
+# --- 2. Why Co-Construction Matters ---
+st.header("2️⃣ Why Co-Construction Matters: Methodological Positioning")
+with st.expander("Expand to read about co-construction", expanded=False):
+    st.markdown("""
+        This research fits within the interpretive strand of **Computational Social Science (CSS)**, where models are informed by qualitative context as much as by data patterns.
+
+        **Key Lessons:**
+        - Without co-defining research questions with policymakers, even sophisticated models may lack decision relevance.
+        - Co-construction improves both **research uptake** and **policy impact**.
+        - Institutions like **UKRI** now emphasize that policy users should be involved in **all research stages** — from question formulation to analysis and communication.
+        
+        In this project, had we defined objectives jointly, outputs could have been timed and framed better to meet real institutional needs.
+        """)
+# --- 3. The Value of Computational Approaches for Policy ---
+st.header("3️⃣ The Value of Computational Approaches for Policy")
+with st.expander("Expand to read about computational methods in policymaking", expanded=False):
+    st.markdown("""
+        Despite the challenges, computational methods still offer distinct advantages in complex policy settings:
+
+        - **Mapping Complexity:** Formal models can simulate heterogeneous actors and interactions (e.g., land use, epidemics, economic shocks).
+        - **Revealing Networks:** Social network analyses show relational dynamics often hidden in traditional statistics.
+        - **Scenario Testing:** Agent-based and hybrid models allow testing of "what-if" policy scenarios.
+        - **Decision Intelligence:** By surfacing key actors and vulnerabilities, computational models help frame strategic interventions.
+        
+        In fragile borderland contexts, computational tools make hidden patterns visible — a critical input for informed policymaking.
+        
+        **Future Approach:**
+        - Reflexivity: Acknowledge biases and limits of models.
+        - Embeddedness: Build stronger ties between researchers and policy institutions, e.g., via embedded researcher programs.
+        """)
+# --- 4. Conclusion: Towards Collaborative Computational Policy Research ---
+st.header("4️⃣ Conclusion: Towards Collaborative Computational Policy Research")
+st.markdown("""
+    Rather than an afterthought, this supplementary reflection is central to bridging the gap between computational analysis and real-world policy practice.
+
+    **Looking ahead:**
+    - Researchers should engage policymakers from the outset to define problems jointly.
+    - Analytical models should be tailored to policy priorities, not just data availability.
+    - Reflexive, collaborative, and integrative approaches will enhance both scientific rigor and policy utility.
+
+    Ultimately, computational social science can become a **powerful engine for decision intelligence** — but only if it is guided by clear, co-constructed questions from the start.
+    """)
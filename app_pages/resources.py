@@ -0,0 +1,35 @@
+import streamlit as st
+
+st.title("📚 Resources and Downloads")
+st.header("📄 Research Reports")
+st.markdown("""
+    This section provides all downloadable materials related to our research.
+    """)
+col1, col2 = st.columns(2)
+with col1:
+    st.subheader("Research Reports")
+    st.markdown("""
+        - [Download Technical Paper: Computational Framework for Borderland Analysis (PDF)](https://your-link-here.com)
+        - [Download Supplementary Paper: Borderlands, Evidence, and Methodological Pluralism (PDF)](https://your-link-here.com)
+        """)
+with col2:
+    st.subheader("Code Repository")
+    st.markdown("""
+        - [Computational Framework Repository](https://github.com/monyas96/Computational-Framework-for-Borderland-Analysis)
+        - [Interactive Visualization Code](https://github.com/monyas96/Computational-Framework-for-Borderland-Analysis/tree/main/visualization)
+        """)
+    st.subheader("References and Further Reading")
+    st.markdown("""
+        - WorldPop: [https://www.worldpop.org/](https://www.worldpop.org/)
+        - ACLED: [https://acleddata.com/](https://acleddata.com/)
+        - OpenStreetMap: [https://www.openstreetmap.org/](https://www.openstreetmap.org/)
+        - Ethnologue: [https://www.ethnologue.com/](https://www.ethnologue.com/)
+        """)
+st.markdown("---")
+st.markdown("""
+    **License Information:**
+    
+    - Code: MIT License © Moneera Yassien
+    - Data: CC-BY 4.0
+    - Maps: OpenStreetMap License
+    """)
@@ -0,0 +1,155 @@
+import argparse
+import base64
+import glob
+import html
+import io
+import json
+import os
+
+# Served by Streamlit at app/static/slides/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = 'static'
+ASSET_DIR = os.path.join(STATIC_DIR, 'slides')
+ASSET_MANIFEST = 'assets.json'
+STATIC_URL = 'app/static'
+
+# Viewport widths a derivative is made for; narrower sources stop at their own width
+WIDTHS = (640, 1280, 1920)
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+PLACEHOLDER_WIDTH = 24
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+
+
+def source_images(directory='pictures'):
+    return sorted(path for path in glob.glob(os.path.join(directory, '*')) if path.lower().endswith(IMAGE_EXTENSIONS))
+
+
+def flatten(image, background=(255, 255, 255)):
+    """RGB copy of `image` with any transparency composited onto `background`."""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        image = image.convert('RGBA')
+        flat = Image.new('RGB', image.size, background)
+        flat.paste(image, mask=image.getchannel('A'))
+        return flat
+    return image.convert('RGB')
+
+
+def derivative_widths(width, widths=WIDTHS):
+    return sorted({min(w, width) for w in widths})
+
+
+def placeholder(image, width=PLACEHOLDER_WIDTH):
+    """Blurred thumbnail of `image` a few hundred bytes long, as a data URI."""
+    from PIL import ImageFilter
+
+    height = max(1, round(image.height * width / image.width))
+    small = flatten(image).resize((width, height)).filter(ImageFilter.GaussianBlur(1))
+    buffer = io.BytesIO()
+    small.save(buffer, 'WEBP', quality=40)
+    return 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode()
+
+
+def build_derivatives(source, output_dir, digest, widths=WIDTHS):
+    """Resized WebP and JPEG copies of `source`, named by its content hash so they can be cached forever."""
+    from PIL import Image, ImageOps
+
+    stem = os.path.splitext(os.path.basename(source))[0].strip().replace(' ', '_')
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    entry = {'hash': digest, 'width': image.width, 'height': image.height,
+             'placeholder': placeholder(image), 'derivatives': []}
+    for width in derivative_widths(image.width, widths):
+        height = round(image.height * width / image.width)
+        resized = image.resize((width, height), Image.LANCZOS) if width != image.width else image
+        names = {'webp': f'{stem}-{digest[:12]}-{width}.webp', 'jpeg': f'{stem}-{digest[:12]}-{width}.jpg'}
+        # WebP keeps transparency; the JPEG fallback is flattened onto white
+        resized.save(os.path.join(output_dir, names['webp']), 'WEBP', quality=WEBP_QUALITY, method=6)
+        flatten(resized).save(os.path.join(output_dir, names['jpeg']), 'JPEG', quality=JPEG_QUALITY,
+                              optimize=True, progressive=True)
+        entry['derivatives'].append(dict(names, width=width, height=height, bytes={
+            fmt: os.path.getsize(os.path.join(output_dir, name)) for fmt, name in names.items()
+        }))
+    return entry
+
+
+def read_manifest(output_dir=ASSET_DIR):
+    path = os.path.join(output_dir, ASSET_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def build_assets(sources, output_dir=ASSET_DIR, widths=WIDTHS, force=False):
+    """Derivatives and placeholders for every source image, skipping those whose hash is unchanged.
+
+    Entries for other sources that still exist are kept; files of earlier
+    versions of a source are removed once it is rebuilt.
+    """
+    # Imported here so the slide viewer can use this module without pandas
+    from ingest import file_hash
+
+    os.makedirs(output_dir, exist_ok=True)
+    previous = read_manifest(output_dir)
+    manifest = {source: entry for source, entry in previous.items() if source not in sources and os.path.exists(source)}
+    for source in sources:
+        digest = file_hash(source)
+        entry = previous.get(source)
+        current = entry is not None and entry['hash'] == digest and entry.get('widths') == list(widths) and all(
+            os.path.exists(os.path.join(output_dir, d[fmt])) for d in entry['derivatives'] for fmt in ('webp', 'jpeg')
+        )
+        if force or not current:
+            entry = dict(build_derivatives(source, output_dir, digest, widths), widths=list(widths))
+            print(f"Built {source}: {len(entry['derivatives'])} widths")
+        manifest[source] = entry
+
+    kept = {d[fmt] for entry in manifest.values() for d in entry['derivatives'] for fmt in ('webp', 'jpeg')}
+    for name in os.listdir(output_dir):
+        if name != ASSET_MANIFEST and name not in kept:
+            os.remove(os.path.join(output_dir, name))
+    with open(os.path.join(output_dir, ASSET_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def srcset(entry, fmt, output_dir=ASSET_DIR):
+    base = STATIC_URL + '/' + os.path.relpath(output_dir, STATIC_DIR).replace(os.sep, '/')
+    return ', '.join(f"{base}/{d[fmt]} {d['width']}w" for d in entry['derivatives'])
+
+
+def picture_html(entry, alt, sizes='(max-width: 1400px) 100vw, 1400px', output_dir=ASSET_DIR):
+    """<picture> letting the browser pick the WebP (or JPEG) width for its viewport, over the blur placeholder."""
+    fallback = srcset(entry, 'jpeg', output_dir).split(', ')[-1].split(' ')[0]
+    return (
+        f'<picture><source type="image/webp" srcset="{srcset(entry, "webp", output_dir)}" sizes="{sizes}">'
+        f'<img src="{fallback}" srcset="{srcset(entry, "jpeg", output_dir)}" sizes="{sizes}" alt="{html.escape(alt)}" '
+        f'width="{entry["width"]}" height="{entry["height"]}" decoding="async" '
+        f'style="width:100%;height:auto;background:url({entry["placeholder"]}) center/cover no-repeat"></picture>'
+    )
+
+
+def prefetch_html(entry, sizes='(max-width: 1400px) 100vw, 1400px', output_dir=ASSET_DIR):
+    """An invisible image that makes the browser fetch (and cache) the derivative it would pick for `entry`."""
+    return (
+        f'<picture><source type="image/webp" srcset="{srcset(entry, "webp", output_dir)}" sizes="{sizes}">'
+        f'<img srcset="{srcset(entry, "jpeg", output_dir)}" sizes="{sizes}" alt="" aria-hidden="true" '
+        f'style="position:absolute;width:1px;height:1px;opacity:0;pointer-events:none"></picture>'
+    )
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build resized WebP/JPEG derivatives and blur placeholders.')
+    parser.add_argument('sources', nargs='*', help='Source images (default: every image in pictures/)')
+    parser.add_argument('--output', default=ASSET_DIR)
+    parser.add_argument('--widths', nargs='+', type=int, default=list(WIDTHS))
+    parser.add_argument('--force', action='store_true', help='Rebuild even when a source hash is unchanged')
+    args = parser.parse_args()
+
+    manifest = build_assets(args.sources or source_images(), args.output, tuple(args.widths), args.force)
+    before = sum(os.path.getsize(source) for source in manifest)
+    after = sum(max(d['bytes']['webp'] for d in entry['derivatives']) for entry in manifest.values())
+    print(f"{len(manifest)} images: {before / 1e6:.1f} MB of sources, {after / 1e6:.1f} MB as the widest WebP")
@@ -0,0 +1,218 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from ci import calculate_ci
+from mpi import DECAY_PARAMS, calculate_mpi, group_mean, mpi_matrix, normalise
+
+# Synthetic dataset sizes; 'current' matches MastersheetV3.xlsx
+SCALES = {
+    'current': {'markets': 100, 'borders': 13, 'routes': 2_340, 'events': 10_000, 'polygons': 200},
+    'medium': {'markets': 1_000, 'borders': 50, 'routes': 100_000, 'events': 200_000, 'polygons': 2_000},
+    'large': {'markets': 10_000, 'borders': 200, 'routes': 2_000_000, 'events': 1_000_000, 'polygons': 20_000},
+    'xlarge': {'markets': 50_000, 'borders': 500, 'routes': 10_000_000, 'events': 5_000_000, 'polygons': 100_000},
+}
+
+# Synthetic data is spread over the Kenya-Uganda study region
+REGION_BBOX = (29, -5, 42, 5)
+YEARS = (2010, 2024)
+
+
+def synthetic_sheets(markets, borders, routes, seed=0, borders_per_market=3):
+    """MARKETS, BORDERS and MAIN with the standardised workbook schema.
+
+    As in the real data, markets lie near the frontier and trade through a
+    few nearby border posts; MAIN repeats those routes across years.
+    """
+    from scipy.spatial import cKDTree
+
+    from exposure import haversine_km
+
+    rng = np.random.default_rng(seed)
+    lon_min, lat_min, lon_max, lat_max = REGION_BBOX
+    frontier = (lon_min + lon_max) / 2
+
+    border_table = pd.DataFrame({
+        'BorderID': np.arange(1, borders + 1),
+        'Border_Name': [f'Border {i}' for i in range(1, borders + 1)],
+        'Longitude': frontier + rng.normal(0, 0.2, borders),
+        'Latitude': np.linspace(lat_min + 0.5, lat_max - 0.5, borders),
+    })
+    market_table = pd.DataFrame({
+        'MARKETID': np.arange(1, markets + 1),
+        'POP2020': rng.lognormal(9, 1.2, markets).round(),
+        'Name_of_Market': [f'Market {i}' for i in range(1, markets + 1)],
+        'Type': rng.choice(['Urban', 'Rural'], markets, p=[0.3, 0.7]),
+        'Longitude': frontier + rng.uniform(-1.5, 1.5, markets),
+        'Latitude': rng.uniform(lat_min, lat_max, markets),
+    })
+
+    k = min(borders_per_market, borders)
+    _, nearest = cKDTree(border_table[['Longitude', 'Latitude']].to_numpy()).query(
+        market_table[['Longitude', 'Latitude']].to_numpy(), k=k
+    )
+    pair_market = np.repeat(np.arange(markets), k)
+    pair_border = np.asarray(nearest).reshape(markets, k).ravel()
+    # Road distance taken as 1.3x the great-circle distance
+    pair_length = 1300 * haversine_km(
+        market_table['Longitude'].to_numpy()[pair_market], market_table['Latitude'].to_numpy()[pair_market],
+        border_table['Longitude'].to_numpy()[pair_border], border_table['Latitude'].to_numpy()[pair_border],
+    )
+
+    route = rng.integers(0, len(pair_market), routes)
+    main = pd.DataFrame({
+        'year': rng.integers(YEARS[0], YEARS[1], routes),
+        'RouteID': route + 1,
+        'MARKETID': market_table['MARKETID'].to_numpy()[pair_market[route]],
+        'BorderID': border_table['BorderID'].to_numpy()[pair_border[route]],
+        'fatalities': rng.poisson(1.5, routes).astype(np.float64),
+        'event_count': rng.poisson(1, routes).astype(np.float64) + 1,
+        'route_length': pair_length[route],
+    })
+    return {'MARKETS': market_table, 'BORDERS': border_table, 'MAIN': main}
+
+
+def synthetic_events(events, seed=0):
+    """ACLED-style events: year, event_date, latitude, longitude, fatalities."""
+    rng = np.random.default_rng(seed)
+    lon_min, lat_min, lon_max, lat_max = REGION_BBOX
+    dates = pd.Timestamp(f'{YEARS[0]}-01-01') + pd.to_timedelta(rng.integers(0, 365 * (YEARS[1] - YEARS[0]), events), 'D')
+    return pd.DataFrame({
+        'year': dates.year,
+        'event_date': dates.strftime('%Y-%m-%d'),
+        'latitude': rng.uniform(lat_min, lat_max, events),
+        'longitude': rng.uniform(lon_min, lon_max, events),
+        'fatalities': rng.poisson(1, events).astype(np.float64),
+    })
+
+
+def synthetic_polygons(polygons, seed=0):
+    """Ethnographic layer of `name` polygons tiling the region."""
+    import geopandas as gpd
+    import shapely
+
+    rng = np.random.default_rng(seed)
+    lon_min, lat_min, lon_max, lat_max = REGION_BBOX
+    side = int(np.ceil(np.sqrt(polygons)))
+    width, height = (lon_max - lon_min) / side, (lat_max - lat_min) / side
+    x, y = np.meshgrid(lon_min + width * np.arange(side), lat_min + height * np.arange(side))
+    x, y = x.ravel()[:polygons], y.ravel()[:polygons]
+    return gpd.GeoDataFrame(
+        {'name': [f'Group {i}' for i in rng.integers(0, max(polygons // 10, 1), polygons)]},
+        geometry=shapely.box(x, y, x + width, y + height),
+        crs='EPSG:4326',
+    )
+
+
+def timed(func, repeat):
+    seconds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        seconds.append(time.perf_counter() - start)
+    return result, seconds
+
+
+def benchmark_scale(scale, sizes, repeat=3, decays=DECAY_PARAMS, chunk_rows=100_000, work_dir=None):
+    """Time each Layer 1-3 stage on synthetic data of one size."""
+    from exposure import conflict_exposure, straight_routes
+    from overlay import borders_to_gdf, ethnic_mpi_overlay
+
+    sheets = synthetic_sheets(sizes['markets'], sizes['borders'], sizes['routes'])
+    main, markets, borders = sheets['MAIN'], sheets['MARKETS'], sheets['BORDERS']
+    results = []
+
+    def record(layer, stage, func, rows):
+        result, seconds = timed(func, repeat)
+        results.append({
+            'scale': scale, 'layer': layer, 'stage': stage, 'rows': int(rows),
+            'seconds': seconds, 'min': min(seconds), 'median': float(np.median(seconds)),
+        })
+        print(f"{scale:>8} {layer:>7} {stage:<12} {rows:>10,} rows  {min(seconds):9.4f} s")
+        return result
+
+    # Layer 1
+    merged = record('layer1', 'merge', lambda: pd.merge(main, markets, on='MARKETID', how='left'), len(main))
+    merged['route_length_km'] = merged['route_length'] / 1000
+    matrix = record('layer1', 'mpi', lambda: mpi_matrix(merged['route_length_km'], merged['POP2020'], decays),
+                    len(merged))
+    norm = record('layer1', 'normalise', lambda: normalise(matrix), len(merged))
+    record('layer1', 'aggregate', lambda: group_mean(merged['BorderID'].to_numpy(), norm), len(merged))
+    mpi_border_results = record('layer1', 'calculate', lambda: calculate_mpi(merged, decays), len(merged))[1]
+
+    # Layer 2
+    record('layer2', 'ci_groupby', lambda: calculate_ci(main), len(main))
+    with tempfile.TemporaryDirectory(dir=work_dir) as tmp:
+        events_path = os.path.join(tmp, 'events.parquet')
+        synthetic_events(sizes['events']).to_parquet(events_path, index=False)
+        routes = straight_routes(main, markets, borders)
+        record('layer2', 'exposure', lambda: conflict_exposure(events_path, borders, routes, chunk_rows=chunk_rows),
+               sizes['events'])
+
+    # Layer 3
+    mpi_border_results = pd.merge(mpi_border_results, borders, on='BorderID', how='left')
+    polygons = synthetic_polygons(sizes['polygons'])
+    borders_gdf = borders_to_gdf(borders)
+    record('layer3', 'sjoin', lambda: ethnic_mpi_overlay(polygons, borders_gdf, mpi_border_results,
+                                                           [f'Norm_MPI_{j}' for j in decays]), len(polygons))
+    return results
+
+
+def compare(results, baseline, threshold=1.2):
+    """Stages at least `threshold` times slower than in `baseline`, by median."""
+    previous = {(r['scale'], r['layer'], r['stage']): r['median'] for r in baseline['results']}
+    slower = []
+    for r in results['results']:
+        before = previous.get((r['scale'], r['layer'], r['stage']))
+        if before and r['median'] >= threshold * before:
+            slower.append({'scale': r['scale'], 'layer': r['layer'], 'stage': r['stage'],
+                           'before': before, 'after': r['median'], 'ratio': r['median'] / before})
+    return slower
+
+
+def run_benchmarks(scales, repeat=3, chunk_rows=100_000):
+    return {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'scales': {scale: SCALES[scale] for scale in scales},
+        'chunk_rows': chunk_rows,
+        'results': [r for scale in scales for r in benchmark_scale(scale, SCALES[scale], repeat, chunk_rows=chunk_rows)],
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Time Layers 1-3 on synthetic data of increasing size.')
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['current', 'medium'])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help='Event rows streamed per exposure chunk')
+    parser.add_argument('--output', default=None, help='Results JSON (default: benchmarks/<timestamp>.json)')
+    parser.add_argument('--baseline', default=None, help='Earlier results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='Slowdown ratio reported as a regression')
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.scales, args.repeat, args.chunk_rows)
+    output = args.output or os.path.join('benchmarks', datetime.now().strftime('%Y%m%d-%H%M%S') + '.json')
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Benchmark results saved in: {output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            slower = compare(results, json.load(f), args.threshold)
+        for r in slower:
+            print(f"Slower: {r['scale']} {r['layer']} {r['stage']} {r['before']:.4f} s -> {r['after']:.4f} s "
+                  f"({r['ratio']:.2f}x)")
+        if not slower:
+            print(f"No stage is {args.threshold}x slower than {args.baseline}")
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+from pyproj import Transformer
+from scipy.spatial import cKDTree
+
+from ingest import iter_chunks
+from mpi import BUFFER_DISTANCE
+from profiling import profiled
+
+# Projection used for buffering, as in Layer 1
+METRIC_CRS = 'EPSG:3857'
+
+# How population in overlapping catchments is counted:
+#   'all'     - in every catchment that covers it (like a buffer spatial join)
+#   'nearest' - only in the nearest covering market
+#   'split'   - shared equally between the covering markets
+OVERLAP_MODES = ('all', 'nearest', 'split')
+
+
+def buffer_distances(markets, buffers=BUFFER_DISTANCE):
+    """Catchment radius per market from its urban/rural type."""
+    return np.where(markets['Type'].str.strip().str.lower() == 'urban', buffers['urban'], buffers['rural'])
+
+
+@profiled
+def to_metric(longitude, latitude, crs=METRIC_CRS):
+    transformer = Transformer.from_crs('EPSG:4326', crs, always_xy=True)
+    x, y = transformer.transform(np.asarray(longitude, dtype=np.float64), np.asarray(latitude, dtype=np.float64))
+    return np.column_stack([x, y])
+
+
+def covering_markets(tree, radii, points_xy, k=8):
+    """Markets whose catchment covers each point, nearest first.
+
+    Returns (n_points, k) market indices and distances plus a mask of valid
+    entries. `k` grows for the points that may be covered by more than `k`
+    markets.
+    """
+    k = min(k, tree.n)
+    distance, market = tree.query(points_xy, k=k, distance_upper_bound=radii.max())
+    distance, market = distance.reshape(len(points_xy), k), market.reshape(len(points_xy), k)
+    valid = market < tree.n
+    valid[valid] = distance[valid] <= radii[market[valid]]
+
+    # Points whose k-th neighbour is still within the largest radius may have more covering markets
+    crowded = np.flatnonzero(np.isfinite(distance[:, -1]))
+    if len(crowded) and k < tree.n:
+        more_market, more_distance, more_valid = covering_markets(tree, radii, points_xy[crowded], k=2 * k)
+        width = more_market.shape[1]
+        market = np.pad(market, ((0, 0), (0, width - k)), constant_values=tree.n)
+        distance = np.pad(distance, ((0, 0), (0, width - k)), constant_values=np.inf)
+        valid = np.pad(valid, ((0, 0), (0, width - k)))
+        market[crowded], distance[crowded], valid[crowded] = more_market, more_distance, more_valid
+    return market, distance, valid
+
+
+def catchment_population(markets_xy, radii, points_xy, population, overlap='all'):
+    """Population captured by each market's catchment for one chunk of points."""
+    if overlap not in OVERLAP_MODES:
+        raise ValueError(f"overlap must be one of {OVERLAP_MODES}, not {overlap!r}")
+
+    tree = cKDTree(markets_xy)
+    market, _, valid = covering_markets(tree, radii, points_xy)
+    weight = np.broadcast_to(np.asarray(population, dtype=np.float64)[:, None], market.shape)
+
+    if overlap == 'nearest':
+        # Entries are ordered by distance, so keep the first valid one per point
+        valid = valid & (np.cumsum(valid, axis=1) == 1)
+    elif overlap == 'split':
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = weight / valid.sum(axis=1, keepdims=True)
+
+    return np.bincount(market[valid], weights=weight[valid], minlength=tree.n)
+
+
+@profiled
+def assign_population(markets, points_path, value_column='population', overlap='all',
+                      chunk_rows=1_000_000, buffers=BUFFER_DISTANCE):
+    """Population within each market's urban/rural catchment.
+
+    Population points (`x`/`y` in WGS84 plus `value_column`) are streamed from
+    a CSV or Parquet file in chunks, so memory is bounded by `chunk_rows`.
+    """
+    markets_xy = to_metric(markets['Longitude'], markets['Latitude'])
+    radii = buffer_distances(markets, buffers).astype(np.float64)
+
+    totals = np.zeros(len(markets))
+    for chunk in iter_chunks(points_path, columns=['x', 'y', value_column], chunk_rows=chunk_rows):
+        chunk = chunk.dropna()
+        points_xy = to_metric(chunk['x'], chunk['y'])
+        totals += catchment_population(markets_xy, radii, points_xy, chunk[value_column], overlap)
+
+    return pd.DataFrame({'MARKETID': markets['MARKETID'].to_numpy(), 'population': totals})
+
+
+def coverage_histogram(markets_xy, radii, points_xy, population):
+    """Population per market and radius band for one chunk of points.
+
+    Column i holds the population at distances in (radii[i-1], radii[i]].
+    """
+    tree = cKDTree(markets_xy)
+    market, distance, valid = covering_markets(tree, np.full(tree.n, radii[-1]), points_xy)
+    band = np.searchsorted(radii, distance[valid])
+    weight = np.broadcast_to(np.asarray(population, dtype=np.float64)[:, None], market.shape)[valid]
+    counts = np.bincount(market[valid] * len(radii) + band, weights=weight, minlength=tree.n * len(radii))
+    return counts.reshape(tree.n, len(radii))
+
+
+@profiled
+def coverage_curves(markets, points_path, radii, value_column='population', chunk_rows=1_000_000):
+    """Population captured by each market for every candidate radius, in one pass.
+
+    Each point within the largest radius of a market is binned once by its
+    distance; cumulative sums over the sorted radii then give the population
+    within every radius without re-buffering. Overlapping catchments count
+    a point for every market that reaches it, as with `overlap='all'`.
+    """
+    radii = np.unique(np.asarray(radii, dtype=np.float64))
+    markets_xy = to_metric(markets['Longitude'], markets['Latitude'])
+
+    bands = np.zeros((len(markets), len(radii)))
+    for chunk in iter_chunks(points_path, columns=['x', 'y', value_column], chunk_rows=chunk_rows):
+        chunk = chunk.dropna()
+        bands += coverage_histogram(markets_xy, radii, to_metric(chunk['x'], chunk['y']), chunk[value_column])
+
+    captured = np.cumsum(bands, axis=1)
+    return pd.DataFrame({
+        'MARKETID': np.repeat(markets['MARKETID'].to_numpy(), len(radii)),
+        'Type': np.repeat(markets['Type'].to_numpy(), len(radii)),
+        'radius': np.tile(radii, len(markets)),
+        'population': captured.ravel(),
+    })
@@ -0,0 +1,121 @@
+import numpy as np
+import pandas as pd
+
+from ingest import load_arrays, save_arrays
+from profiling import profiled
+
+# MAIN columns that determine the CI of a (year, border) cell
+CI_COLUMNS = ['year', 'BorderID', 'fatalities', 'event_count', 'route_length']
+
+
+def conflict_weight(main_conflict):
+    """CI factor per route row: fatalities plus half the event count."""
+    return main_conflict['fatalities'] + 0.5 * main_conflict['event_count']
+
+
+@profiled
+def calculate_ci(main_conflict):
+    """Temporal Conflict Exposure Index (CI) per year and border post.
+
+    The weighted inverse-distance sum is a single grouped reduction over a
+    precomputed per-route contribution column.
+    """
+    # Verify necessary columns
+    if 'event_count' not in main_conflict.columns or 'fatalities' not in main_conflict.columns:
+        raise KeyError("The required columns 'event_count' and/or 'fatalities' are missing from the MAIN dataset.")
+
+    contribution = conflict_weight(main_conflict).to_numpy(dtype=np.float64) / (
+        main_conflict['route_length'].to_numpy(dtype=np.float64) / 1000
+    )
+    cells = pd.DataFrame({
+        'year': main_conflict['year'].to_numpy(),
+        'BorderID': main_conflict['BorderID'].to_numpy(),
+        'CI': contribution,
+    })
+    return cells.groupby(['year', 'BorderID'], as_index=False)['CI'].sum()
+
+
+def year_hashes(main_conflict):
+    """Order-independent content hash of the CI inputs for each year."""
+    row_hashes = pd.util.hash_pandas_object(main_conflict[CI_COLUMNS], index=False)
+    grouped = row_hashes.groupby(main_conflict['year'].to_numpy())
+    sums, counts = grouped.sum(), grouped.size()
+    return {str(year): f'{sums[year] & 0xFFFFFFFFFFFFFFFF:016x}-{counts[year]}' for year in sums.index}
+
+
+def changed_years(previous_hashes, current_hashes):
+    """Years that were added, removed or edited since `previous_hashes` was recorded."""
+    years = set(previous_hashes) | set(current_hashes)
+    return sorted(int(y) for y in years if previous_hashes.get(y) != current_hashes.get(y))
+
+
+@profiled
+def update_ci(ci_results, main_conflict, years):
+    """Recompute CI only for `years` and merge the new cells into stored `ci_results`.
+
+    Cells of other years are kept as stored; every cell of a recomputed year
+    is replaced, so borders that dropped out of that year disappear too.
+    """
+    fresh = calculate_ci(main_conflict[main_conflict['year'].isin(years)])
+    kept = ci_results.loc[~ci_results['year'].isin(years), ['year', 'BorderID', 'CI']]
+    return pd.concat([kept, fresh], ignore_index=True).sort_values(['year', 'BorderID'], ignore_index=True)
+
+
+# Border x time-bin CI cube
+CUBE_ARRAYS = ['border_ids', 'border_names', 'bins', 'cube', 'prefix']
+
+
+@profiled
+def build_cube(cells, time_column, bins, borders, value_column='CI'):
+    """Border x time-bin matrix of `value_column` from long (time, BorderID) cells.
+
+    `bins` lists every time bin in order, so empty bins are zeros and windows
+    cover real time. Alongside the float32 cube, prefix sums over time (with a
+    leading zero column) let any window or cumulative total be read in O(1).
+    """
+    border_ids = np.sort(cells['BorderID'].dropna().unique())
+    names = borders.drop_duplicates('BorderID').set_index('BorderID')['Border_Name'].reindex(border_ids).fillna('')
+
+    row = pd.Index(border_ids).get_indexer(cells['BorderID'])
+    col = pd.Index(bins).get_indexer(cells[time_column])
+    keep = (row >= 0) & (col >= 0)
+    cube = np.zeros((len(border_ids), len(bins)))
+    np.add.at(cube, (row[keep], col[keep]), cells[value_column].to_numpy(dtype=np.float64)[keep])
+
+    prefix = np.zeros((len(border_ids), len(bins) + 1))
+    np.cumsum(cube, axis=1, out=prefix[:, 1:])
+    return {
+        'border_ids': border_ids,
+        'border_names': names.to_numpy().astype(str),
+        'bins': np.asarray([str(b) for b in bins]),
+        'cube': cube.astype(np.float32),
+        'prefix': prefix,
+    }
+
+
+def annual_cube(ci_results):
+    """CI cube with one bin per year, from the rows of `ci_results`."""
+    years = range(int(ci_results['year'].min()), int(ci_results['year'].max()) + 1)
+    return build_cube(ci_results, 'year', years, ci_results)
+
+
+def save_cube(cube, output_dir):
+    save_arrays(cube, output_dir)
+
+
+def load_cube(output_dir, mmap_mode='r'):
+    return load_arrays(output_dir, CUBE_ARRAYS, mmap_mode)
+
+
+def window_sum(prefix, start, stop):
+    """Total per border over time bins [start, stop)."""
+    return prefix[:, stop] - prefix[:, start]
+
+
+def rolling_sum(prefix, window):
+    """Trailing `window`-bin totals per border, aligned with the bin each window ends on."""
+    return prefix[:, window:] - prefix[:, :-window]
+
+
+def cumulative(prefix):
+    return prefix[:, 1:]
@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+import shapely
+from pyproj import Transformer
+from scipy.spatial import cKDTree
+
+from ci import conflict_weight
+from ingest import iter_chunks
+from profiling import profiled
+
+EARTH_RADIUS_KM = 6371.0088
+
+# ACLED export columns read for each event
+EVENT_COLUMNS = ['year', 'latitude', 'longitude', 'fatalities']
+
+# Events further than this from a border post or route corridor are ignored
+EXPOSURE_RADIUS_KM = 20
+
+# Exposure of an event at distance d (km) is its CI weight * exp(-decay * d)
+EXPOSURE_DECAY = 0.1
+
+
+def unit_vectors(longitude, latitude):
+    """Points on the unit sphere, so straight-line KD-tree distances map to great-circle ones."""
+    lon, lat = np.radians(np.asarray(longitude, dtype=np.float64)), np.radians(np.asarray(latitude, dtype=np.float64))
+    return np.column_stack([np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)])
+
+
+def haversine_km(lon1, lat1, lon2, lat2):
+    lon1, lat1, lon2, lat2 = map(np.radians, (lon1, lat1, lon2, lat2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+
+
+def event_weight(events):
+    """CI weight of a single event: its fatalities plus half an event."""
+    return conflict_weight(events.assign(event_count=1)).to_numpy(dtype=np.float64)
+
+
+def straight_routes(main, markets, borders):
+    """Straight market-to-border corridors for each MAIN route, when no route geometry is available."""
+    routes = main[['RouteID', 'MARKETID', 'BorderID']].drop_duplicates('RouteID')
+    routes = routes.merge(markets[['MARKETID', 'Longitude', 'Latitude']], on='MARKETID')
+    routes = routes.merge(borders[['BorderID', 'Longitude', 'Latitude']], on='BorderID', suffixes=('_market', '_border'))
+    coords = np.stack([
+        routes[['Longitude_market', 'Latitude_market']].to_numpy(),
+        routes[['Longitude_border', 'Latitude_border']].to_numpy(),
+    ], axis=1)
+    return pd.DataFrame({'RouteID': routes['RouteID'].to_numpy(), 'geometry': shapely.linestrings(coords)})
+
+
+def local_projection(geometries):
+    """Azimuthal equidistant projection centred on the study area, in metres."""
+    lon, lat = shapely.centroid(shapely.union_all(shapely.envelope(geometries))).coords[0]
+    return Transformer.from_crs('EPSG:4326', f'+proj=aeqd +lat_0={lat} +lon_0={lon} +units=m', always_xy=True)
+
+
+def border_pairs(borders_xyz, events, radius_km):
+    """(event, border) index pairs within `radius_km` great-circle distance."""
+    chord = 2 * np.sin(radius_km / (2 * EARTH_RADIUS_KM))
+    event_tree = cKDTree(unit_vectors(events['longitude'], events['latitude']))
+    hits = event_tree.query_ball_point(borders_xyz, r=chord, return_sorted=False)
+    counts = np.fromiter((len(h) for h in hits), dtype=np.int64, count=len(hits))
+    border_idx = np.repeat(np.arange(len(hits)), counts)
+    event_idx = np.concatenate([np.asarray(h, dtype=np.int64) for h in hits]) if len(hits) else np.empty(0, np.int64)
+    return event_idx, border_idx
+
+
+def route_pairs(route_tree, routes_xy, events, transformer, radius_km):
+    """(event, route) index pairs within `radius_km` of the route line, with distances in km."""
+    x, y = transformer.transform(events['longitude'].to_numpy(), events['latitude'].to_numpy())
+    points = shapely.points(x, y)
+    event_idx, route_idx = route_tree.query(points, predicate='dwithin', distance=radius_km * 1000)
+    distance_km = shapely.distance(points[event_idx], routes_xy[route_idx]) / 1000
+    return event_idx, route_idx, distance_km
+
+
+def aggregate_exposure(time, key, key_name, weight, distance_km, decay, time_column='year'):
+    cells = pd.DataFrame({
+        time_column: time,
+        key_name: key,
+        'exposure': weight * np.exp(-decay * distance_km),
+        'events': 1,
+    })
+    return cells.groupby([time_column, key_name], as_index=False)[['exposure', 'events']].sum()
+
+
+def parse_dates(values):
+    # ACLED exports use either ISO dates or "15 March 2023"; infer once per chunk, element-wise only if mixed
+    try:
+        return pd.to_datetime(values)
+    except ValueError:
+        return pd.to_datetime(values, format='mixed')
+
+
+@profiled
+def border_exposure_series(events_path, borders, freqs=('M', 'W'), radius_km=EXPOSURE_RADIUS_KM,
+                           decay=EXPOSURE_DECAY, chunk_rows=1_000_000):
+    """Sub-annual border exposure: one (period, BorderID) table per pandas frequency in `freqs`.
+
+    Events need an `event_date` column; periods are pandas Periods so every
+    frequency lines up with `pd.period_range`.
+    """
+    borders_xyz = unit_vectors(borders['Longitude'], borders['Latitude'])
+    border_ids = borders['BorderID'].to_numpy()
+
+    parts = {freq: [] for freq in freqs}
+    columns = ['event_date'] + [c for c in EVENT_COLUMNS if c != 'year']
+    for events in iter_chunks(events_path, columns=columns, chunk_rows=chunk_rows):
+        events = events.dropna(subset=['event_date', 'latitude', 'longitude']).reset_index(drop=True)
+        events['fatalities'] = events['fatalities'].fillna(0)
+        dates = parse_dates(events['event_date'])
+        weight = event_weight(events)
+
+        event_idx, border_idx = border_pairs(borders_xyz, events, radius_km)
+        distance_km = haversine_km(
+            events['longitude'].to_numpy()[event_idx], events['latitude'].to_numpy()[event_idx],
+            borders['Longitude'].to_numpy()[border_idx], borders['Latitude'].to_numpy()[border_idx],
+        )
+        for freq in freqs:
+            period = dates.dt.to_period(freq).to_numpy()[event_idx]
+            parts[freq].append(aggregate_exposure(
+                period, border_ids[border_idx], 'BorderID', weight[event_idx], distance_km, decay, 'period'
+            ))
+
+    empty = pd.DataFrame({'period': [], 'BorderID': [], 'exposure': [], 'events': []})
+    return {
+        freq: pd.concat(tables or [empty]).groupby(['period', 'BorderID'], as_index=False).sum()
+        for freq, tables in parts.items()
+    }
+
+
+@profiled
+def conflict_exposure(events_path, borders, routes, radius_km=EXPOSURE_RADIUS_KM, decay=EXPOSURE_DECAY,
+                      chunk_rows=1_000_000):
+    """Distance-decayed conflict exposure per year for every border post and route corridor.
+
+    Events are streamed from a CSV or Parquet ACLED export in chunks, so memory
+    is bounded by `chunk_rows`. Border posts are matched by great-circle
+    distance through a KD-tree of the events on the unit sphere; route
+    corridors through an STRtree of the routes in a local equidistant
+    projection.
+    """
+    borders_xyz = unit_vectors(borders['Longitude'], borders['Latitude'])
+    border_ids = borders['BorderID'].to_numpy()
+
+    transformer = local_projection(routes['geometry'].to_numpy())
+    routes_xy = shapely.transform(
+        routes['geometry'].to_numpy(), lambda xy: np.column_stack(transformer.transform(xy[:, 0], xy[:, 1]))
+    )
+    route_tree = shapely.STRtree(routes_xy)
+    route_ids = routes['RouteID'].to_numpy()
+
+    border_parts, route_parts = [], []
+    for events in iter_chunks(events_path, columns=EVENT_COLUMNS, chunk_rows=chunk_rows):
+        events = events.dropna(subset=['latitude', 'longitude']).reset_index(drop=True)
+        events['fatalities'] = events['fatalities'].fillna(0)
+        weight = event_weight(events)
+        year = events['year'].to_numpy()
+
+        event_idx, border_idx = border_pairs(borders_xyz, events, radius_km)
+        distance_km = haversine_km(
+            events['longitude'].to_numpy()[event_idx], events['latitude'].to_numpy()[event_idx],
+            borders['Longitude'].to_numpy()[border_idx], borders['Latitude'].to_numpy()[border_idx],
+        )
+        border_parts.append(aggregate_exposure(
+            year[event_idx], border_ids[border_idx], 'BorderID', weight[event_idx], distance_km, decay
+        ))
+
+        event_idx, route_idx, distance_km = route_pairs(route_tree, routes_xy, events, transformer, radius_km)
+        route_parts.append(aggregate_exposure(
+            year[event_idx], route_ids[route_idx], 'RouteID', weight[event_idx], distance_km, decay
+        ))
+
+    # Chunks may share (year, key) cells, so sum the partial aggregates; a file without rows gives empty tables
+    border_parts = border_parts or [pd.DataFrame({'year': [], 'BorderID': [], 'exposure': [], 'events': []})]
+    route_parts = route_parts or [pd.DataFrame({'year': [], 'RouteID': [], 'exposure': [], 'events': []})]
+    border_exposure = pd.concat(border_parts).groupby(['year', 'BorderID'], as_index=False).sum()
+    route_exposure = pd.concat(route_parts).groupby(['year', 'RouteID'], as_index=False).sum()
+    return border_exposure, route_exposure
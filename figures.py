@@ -0,0 +1,144 @@
+import hashlib
+import inspect
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+import seaborn as sns
+
+from profiling import profiled
+
+# Written next to the figures: one entry per asset with the hash of its inputs
+FIGURE_MANIFEST = 'figures.json'
+
+
+def mpi_bar_chart(mpi_border_results, mpi_columns, path):
+    # Visualization: MPI by Border Post (Bar Chart)
+    plt.figure(figsize=(12, 8))
+    mpi_border_results.set_index('Border_Name')[mpi_columns].plot(kind='bar')
+    plt.title('Market Potential Index (MPI) by Border Post')
+    plt.ylabel('Market Potential Index (MPI)')
+    plt.xlabel('Border Name')
+    plt.legend(title='Decay Parameter')
+    plt.ylim(0, 1)  # Ensure y-axis is limited between 0 and 1
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close('all')
+
+
+def mpi_heatmap(mpi_border_results, decay, path):
+    # Visualization: MPI Heatmap
+    plt.figure(figsize=(10, 6))
+    pivot_table = mpi_border_results.set_index('Border_Name')[[f'Norm_MPI_{decay}']]
+    sns.heatmap(
+        pivot_table,
+        annot=True,
+        fmt=".2f",
+        cmap="YlGnBu",
+        cbar_kws={"label": f"Market Potential Index (Decay {decay})"},
+        vmin=0, vmax=1  # Ensure heatmap scale is 0 to 1
+    )
+    plt.title(f'Market Potential Index (MPI) for Decay {decay}')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def ci_by_border_year(ci_results):
+    # Ensure 'ci_results' has unique combinations of 'Border_Name' and 'year'
+    return ci_results.groupby(['Border_Name', 'year'], as_index=False).agg({'CI': 'sum'})
+
+
+def ci_temporal_trends(ci_results_agg, path):
+    # Visualization: Temporal Trends in CI
+    plt.figure(figsize=(12, 8))
+    sns.lineplot(data=ci_results_agg, x='year', y='CI', hue='Border_Name', marker="o")
+    plt.title('Temporal Trends in Conflict Exposure Index (CI)')
+    plt.ylabel('CI Value')
+    plt.xlabel('Year')
+    plt.legend(title='Border Name', bbox_to_anchor=(1.05, 1), loc='upper left')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def ci_heatmap(ci_results_agg, path):
+    # Visualization: Heatmap of CI
+    ci_pivot = ci_results_agg.pivot(index='Border_Name', columns='year', values='CI')
+    plt.figure(figsize=(12, 8))
+    sns.heatmap(ci_pivot, annot=True, fmt=".2f", cmap="YlGnBu", cbar_kws={"label": "CI Value"})
+    plt.title('Conflict Exposure Index (CI) by Border and Year')
+    plt.ylabel('Border Name')
+    plt.xlabel('Year')
+    plt.tight_layout()
+    plt.savefig(path)
+    plt.close()
+
+
+def figure_specs(mpi_border_results, ci_results, decays):
+    """(filename, render function, data, params) for every figure, with only the data each one draws."""
+    mpi_columns = [f'Norm_MPI_{j}' for j in decays]
+    specs = [('MPI_bar_chart.png', mpi_bar_chart, mpi_border_results[['Border_Name'] + mpi_columns], [mpi_columns])]
+    for j in decays:
+        specs.append((f'MPI_heatmap_decay_{j}.png', mpi_heatmap,
+                      mpi_border_results[['Border_Name', f'Norm_MPI_{j}']], [j]))
+
+    ci_results_agg = ci_by_border_year(ci_results)
+    specs += [
+        ('ci_temporal_trends.png', ci_temporal_trends, ci_results_agg, []),
+        ('ci_heatmap.png', ci_heatmap, ci_results_agg, []),
+    ]
+    return specs
+
+
+def figure_hash(func, data, params):
+    """Hash of a figure's drawing code, input data and parameters."""
+    digest = hashlib.sha256(inspect.getsource(func).encode())
+    digest.update(json.dumps([list(map(str, data.columns)), params, matplotlib.__version__, sns.__version__]).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def render_figure(func, data, params, path):
+    func(data, *params, path)
+    return os.path.getsize(path)
+
+
+def read_manifest(output_dir):
+    path = os.path.join(output_dir, FIGURE_MANIFEST)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+@profiled
+def render_all(mpi_border_results, ci_results, decays, output_dir, max_workers=None, force=False):
+    """Render the pipeline figures with the Agg backend on a process pool.
+
+    A figure is skipped when its file exists and its hash matches the
+    manifest from the previous run. The manifest is rewritten with every
+    asset's hash, size and whether it was rendered or skipped.
+    """
+    previous = read_manifest(output_dir)
+    manifest = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        for filename, func, data, params in figure_specs(mpi_border_results, ci_results, decays):
+            path = os.path.join(output_dir, filename)
+            key = figure_hash(func, data, params)
+            if not force and os.path.exists(path) and previous.get(filename, {}).get('hash') == key:
+                manifest[filename] = dict(previous[filename], status='skipped')
+            else:
+                manifest[filename] = {'hash': key, 'bytes': pool.submit(render_figure, func, data, params, path),
+                                      'status': 'rendered'}
+        for entry in manifest.values():
+            if entry['status'] == 'rendered':
+                entry['bytes'] = entry['bytes'].result()
+
+    with open(os.path.join(output_dir, FIGURE_MANIFEST), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
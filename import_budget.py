@@ -0,0 +1,85 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+from app_pages import PAGES
+
+APP = 'app.py'
+
+# Libraries that only the chart and data pages should load
+HEAVY_MODULES = ['pandas', 'numpy', 'pyarrow', 'altair', 'plotly', 'pydeck', 'matplotlib', 'seaborn', 'geopandas',
+                 'scipy']
+
+IMPORT_TIME = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def run_page(page=None):
+    """Cold-start the app in this interpreter, open `page` (a module in app_pages), and report the time and
+    heavy modules loaded."""
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    cold_start = time.perf_counter() - start
+    if page is not None:
+        at.switch_page(os.path.join('app_pages', page)).run()
+    if at.exception:
+        raise RuntimeError(f"{page or 'landing page'}: {at.exception[0].message}")
+    return {
+        'page': page or PAGES[0][0],
+        'cold_start_s': cold_start,
+        'total_s': time.perf_counter() - start,
+        'heavy_modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }
+
+
+def slowest_imports(stderr, top=10):
+    """Top-level modules by cumulative import time (microseconds), from `python -X importtime` output."""
+    times = {}
+    for line in stderr.splitlines():
+        match = IMPORT_TIME.match(line)
+        if match and len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return sorted(times.items(), key=lambda item: -item[1])[:top]
+
+
+def measure(page=None):
+    """Run `run_page` in a fresh interpreter so no import is already cached."""
+    command = [sys.executable, '-X', 'importtime', __file__, '--child'] + ([page] if page else [])
+    process = subprocess.run(command, capture_output=True, text=True)
+    if process.returncode:
+        raise RuntimeError(process.stderr[-2000:])
+    result = json.loads(process.stdout.splitlines()[-1])
+    result['slowest_imports'] = slowest_imports(process.stderr)
+    return result
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Check the app cold start against an import-time budget.')
+    parser.add_argument('--budget', type=float, default=2.0, help='Seconds allowed for a cold start of the landing page')
+    parser.add_argument('--all-pages', action='store_true', help='Also report the time and heavy modules of each page')
+    parser.add_argument('--child', nargs='?', const='', default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child is not None:
+        print(json.dumps(run_page(args.child or None)))
+        sys.exit()
+
+    landing = measure()
+    print(f"Cold start of {landing['page']}: {landing['cold_start_s']:.2f} s (budget {args.budget:.2f} s)")
+    print(f"  heavy modules loaded: {', '.join(landing['heavy_modules']) or 'none'}")
+    if args.all_pages:
+        for page, _, _ in PAGES[1:]:
+            result = measure(page)
+            print(f"{page}: {result['total_s']:.2f} s, heavy modules: {', '.join(result['heavy_modules']) or 'none'}")
+
+    if landing['cold_start_s'] > args.budget:
+        print('Slowest imports (cumulative ms):')
+        for name, microseconds in landing['slowest_imports']:
+            print(f"  {name:<40} {microseconds / 1000:9.1f}")
+        sys.exit(f"Cold start is over the {args.budget:.2f} s budget")
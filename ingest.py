@@ -0,0 +1,114 @@
+import hashlib
+import inspect
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from profiling import profiled
+
+# Workbook sheets used by the analysis, with their standardised column names
+SHEET_RENAMES = {
+    'MARKETS': {'MARKETID2': 'MARKETID', 'X': 'Longitude', 'Y': 'Latitude'},
+    'MAIN': {
+        'MARKETI D2': 'MARKETID',
+        'route_Length(meter)': 'route_length',
+        'conflict event_Count': 'event_count',
+    },
+    'BORDERS': {'ID': 'BorderID', 'Border name': 'Border_Name', 'X': 'Longitude', 'Y': 'Latitude'},
+}
+
+# Null marker written by the GIS export
+NULL_MARKER = '<Null>'
+
+
+def file_hash(file_path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def coerce_types(df):
+    """Give mixed object columns a single type so they can be stored as Parquet."""
+    for col in df.columns[df.dtypes == object]:
+        values = df[col].replace(NULL_MARKER, None)
+        try:
+            df[col] = pd.to_numeric(values)
+        except (ValueError, TypeError):
+            df[col] = values.astype('string')
+    return df
+
+
+@profiled
+def parse_workbook(file_path, sheets=SHEET_RENAMES):
+    """Parse each sheet of the workbook once and standardise its columns."""
+    raw = pd.read_excel(file_path, sheet_name=list(sheets))
+    return {name: coerce_types(raw[name].rename(columns=renames)) for name, renames in sheets.items()}
+
+
+def parser_version():
+    """Hash of the column renames, null marker and parsing code, so changing any of them re-parses the workbook."""
+    digest = hashlib.sha256(json.dumps([SHEET_RENAMES, NULL_MARKER], sort_keys=True).encode())
+    for func in (coerce_types, parse_workbook):
+        digest.update(inspect.getsource(inspect.unwrap(func)).encode())
+    return digest.hexdigest()
+
+
+@profiled
+def load_workbook(file_path, cache_dir=None):
+    """Standardised workbook sheets, served from a Parquet cache keyed by the workbook's content hash
+    and the parser version.
+
+    The cache lives in a `cache/` folder next to the workbook unless `cache_dir` is given.
+    """
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(file_path)), 'cache')
+    sheet_dir = os.path.join(cache_dir, file_hash(file_path), parser_version()[:16])
+    paths = {name: os.path.join(sheet_dir, f'{name}.parquet') for name in SHEET_RENAMES}
+
+    if all(os.path.exists(path) for path in paths.values()):
+        return {name: pd.read_parquet(path) for name, path in paths.items()}
+
+    sheets = parse_workbook(file_path)
+    os.makedirs(sheet_dir, exist_ok=True)
+    for name, df in sheets.items():
+        # Write then rename so an interrupted run never leaves a partial cache entry
+        tmp_path = paths[name] + '.tmp'
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, paths[name])
+    return sheets
+
+
+def iter_chunks(path, columns=None, chunk_rows=1_000_000):
+    """Stream a CSV or Parquet table as DataFrames of at most `chunk_rows` rows."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=columns):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=columns, chunksize=chunk_rows)
+
+
+def table_columns(path):
+    """Column names of a CSV or Parquet table, without reading its rows."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        return pq.ParquetFile(path).schema_arrow.names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+@profiled
+def save_arrays(arrays, output_dir):
+    """Store each array as .npy so it can be memory-mapped later."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, array in arrays.items():
+        np.save(os.path.join(output_dir, f'{name}.npy'), array)
+
+
+def load_arrays(output_dir, names, mmap_mode='r'):
+    return {name: np.load(os.path.join(output_dir, f'{name}.npy'), mmap_mode=mmap_mode) for name in names}
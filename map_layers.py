@@ -0,0 +1,143 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from ci import conflict_weight
+from profiling import profiled
+
+# Edge length (centre to vertex) of the population hexagons
+HEX_SIZE_KM = 10
+
+LAYER_FILES = {name: f'{name}.parquet' for name in ('borders', 'markets', 'routes', 'hexes')}
+
+# YlGnBu, as in the heatmaps
+COLOUR_STOPS = np.array([
+    [255, 255, 217], [199, 233, 180], [65, 182, 196], [34, 94, 168], [8, 29, 88]
+], dtype=np.float64)
+
+SQRT3 = np.sqrt(3)
+
+
+def colour_ramp(values, vmin=None, vmax=None):
+    """RGB rows (uint8) for `values` on the YlGnBu ramp; missing values are grey."""
+    values = np.asarray(values, dtype=np.float64)
+    vmin = np.nanmin(values) if vmin is None else vmin
+    vmax = np.nanmax(values) if vmax is None else vmax
+    t = np.clip((values - vmin) / (vmax - vmin), 0, 1) if vmax > vmin else np.zeros_like(values)
+    position = np.nan_to_num(t) * (len(COLOUR_STOPS) - 1)
+    lower = np.minimum(position.astype(np.int64), len(COLOUR_STOPS) - 2)
+    frac = (position - lower)[:, None]
+    rgb = COLOUR_STOPS[lower] * (1 - frac) + COLOUR_STOPS[lower + 1] * frac
+    rgb[np.isnan(values)] = 160
+    return rgb.round().astype(np.uint8)
+
+
+def hex_index(x, y, size):
+    """Axial (q, r) coordinates of the pointy-top hexagon of edge `size` containing each point."""
+    q = (SQRT3 / 3 * x - y / 3) / size
+    r = (2 / 3 * y) / size
+    # Round in cube coordinates, fixing the component with the largest rounding error
+    s = -q - r
+    rq, rr, rs = np.round(q), np.round(r), np.round(s)
+    dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+    fix_q = (dq > dr) & (dq > ds)
+    fix_r = ~fix_q & (dr > ds)
+    rq = np.where(fix_q, -rr - rs, rq)
+    rr = np.where(fix_r, -rq - rs, rr)
+    return rq.astype(np.int64), rr.astype(np.int64)
+
+
+def hex_centres(q, r, size):
+    return size * SQRT3 * (q + r / 2), size * 1.5 * r
+
+
+def bin_points(x, y, weights, size):
+    q, r = hex_index(x, y, size)
+    return pd.DataFrame({'q': q, 'r': r, 'population': weights}).groupby(['q', 'r'], as_index=False)['population'].sum()
+
+
+@profiled
+def population_hexes(markets, points_path=None, size_km=HEX_SIZE_KM, value_column='population', chunk_rows=1_000_000):
+    """Population summed into hexagons, binned in Web Mercator so they tile on the map.
+
+    Population points are streamed from `points_path` in chunks; without
+    one, each market's population stands in as a point.
+    """
+    from pyproj import Transformer
+
+    from catchment import to_metric
+    from ingest import iter_chunks
+
+    size = size_km * 1000
+    if points_path:
+        bins = []
+        for chunk in iter_chunks(points_path, columns=['x', 'y', value_column], chunk_rows=chunk_rows):
+            chunk = chunk.dropna()
+            xy = to_metric(chunk['x'], chunk['y'])
+            bins.append(bin_points(xy[:, 0], xy[:, 1], chunk[value_column].to_numpy(dtype=np.float64), size))
+        cells = pd.concat(bins).groupby(['q', 'r'], as_index=False)['population'].sum()
+    else:
+        markets = markets.dropna(subset=['Longitude', 'Latitude', 'POP2020'])
+        xy = to_metric(markets['Longitude'], markets['Latitude'])
+        cells = bin_points(xy[:, 0], xy[:, 1], markets['POP2020'].to_numpy(dtype=np.float64), size)
+
+    x, y = hex_centres(cells['q'].to_numpy(), cells['r'].to_numpy(), size)
+    longitude, latitude = Transformer.from_crs('EPSG:3857', 'EPSG:4326', always_xy=True).transform(x, y)
+    # Mercator metres shrink by cos(latitude) on the ground
+    return pd.DataFrame({'Longitude': longitude, 'Latitude': latitude, 'population': cells['population'].to_numpy(),
+                         'radius_m': size * np.cos(np.radians(latitude))})
+
+
+@profiled
+def build_layers(main, markets, borders, mpi_market_results, mpi_border_results, ci_results, decays):
+    """Border, market and route tables for the app map, with MPI and CI attributes.
+
+    A route is a market-border pair; its CI sums the per-row contributions of
+    `calculate_ci` over every year, and its MPI is that of its market.
+    """
+    mpi_cols = [f'Norm_MPI_{j}' for j in decays]
+    borders = borders.drop_duplicates('BorderID').dropna(subset=['Longitude', 'Latitude'])
+    # Strips the spaces and non-breaking spaces padding some border names
+    borders = borders.assign(Border_Name=borders['Border_Name'].astype('string').str.strip())
+    border_ci = ci_results.groupby('BorderID')['CI'].sum().rename('CI')
+    border_layer = borders[['BorderID', 'Border_Name', 'Longitude', 'Latitude']].merge(
+        mpi_border_results[['BorderID'] + mpi_cols], on='BorderID', how='left'
+    ).merge(border_ci, on='BorderID', how='left')
+
+    markets = markets.drop_duplicates('MARKETID').dropna(subset=['Longitude', 'Latitude'])
+    # Names exported from Excel carry escaped carriage returns
+    markets = markets.assign(Name_of_Market=markets['Name_of_Market'].astype('string').str.replace('_x000D_', '')
+                             .str.strip())
+    market_layer = markets[['MARKETID', 'Name_of_Market', 'Type', 'Longitude', 'Latitude', 'POP2020']].merge(
+        mpi_market_results[['MARKETID'] + mpi_cols], on='MARKETID', how='left'
+    )
+
+    contribution = conflict_weight(main) / (main['route_length'] / 1000)
+    routes = main[['MARKETID', 'BorderID', 'route_length']].assign(CI=contribution).groupby(
+        ['MARKETID', 'BorderID'], as_index=False
+    ).agg(route_length_km=('route_length', 'mean'), CI=('CI', 'sum'))
+    routes['route_length_km'] /= 1000
+    routes = routes.merge(
+        market_layer[['MARKETID', 'Name_of_Market', 'Longitude', 'Latitude'] + mpi_cols], on='MARKETID'
+    ).merge(
+        border_layer[['BorderID', 'Border_Name', 'Longitude', 'Latitude']], on='BorderID',
+        suffixes=('_market', '_border')
+    )
+    return {'borders': border_layer, 'markets': market_layer, 'routes': routes}
+
+
+def save_layers(layers, directory):
+    """Each layer as Parquet, with float32 attributes and float64 coordinates."""
+    os.makedirs(directory, exist_ok=True)
+    for name, table in layers.items():
+        table = table.copy()
+        for col in table.columns[table.dtypes == np.float64]:
+            if not col.startswith(('Longitude', 'Latitude')):
+                table[col] = table[col].astype(np.float32)
+        table.to_parquet(os.path.join(directory, LAYER_FILES[name]), index=False)
+
+
+def load_layers(directory):
+    return {name: pd.read_parquet(os.path.join(directory, filename))
+            for name, filename in LAYER_FILES.items() if os.path.exists(os.path.join(directory, filename))}
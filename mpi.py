@@ -0,0 +1,269 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ingest import iter_chunks, load_arrays, load_workbook, save_arrays
+from profiling import profiled
+
+# Decay parameters used across Layer 1
+DECAY_PARAMS = [0.02, 0.03, 0.05]
+
+# Market catchment radius in metres by market type, behind the POP2020 populations of Layer 1
+BUFFER_DISTANCE = {'urban': 1500, 'rural': 3000}
+
+# Arrays stored by the decay sweep
+SWEEP_ARRAYS = ['decays', 'market_ids', 'market_cube', 'border_ids', 'border_cube']
+
+
+def mpi_matrix(route_length_km, population, decays):
+    """Routes x decays matrix of exp(-decay * distance) * population, in one broadcast.
+
+    The matrix is column-major so each decay column is contiguous for the
+    normalisation and aggregation passes.
+    """
+    distance = np.asarray(route_length_km, dtype=np.float64)
+    population = np.asarray(population, dtype=np.float64)
+    decays = np.asarray(decays, dtype=np.float64)
+    matrix = np.multiply.outer(-decays, distance)
+    np.exp(matrix, out=matrix)
+    matrix *= population
+    return matrix.T
+
+
+def normalise(matrix):
+    """Global min-max normalisation of each decay column (NaNs ignored)."""
+    low = np.fmin.reduce(matrix, axis=0)
+    high = np.fmax.reduce(matrix, axis=0)
+    norm = matrix - low
+    norm /= high - low
+    return norm
+
+
+def group_totals(keys, matrix):
+    """Sum and count of the non-NaN values of each matrix column per key."""
+    codes, uniques = pd.factorize(np.asarray(keys), sort=True)
+    n_groups = len(uniques)
+    keep = codes >= 0
+
+    sums = np.empty((n_groups, matrix.shape[1]))
+    counts = np.empty((n_groups, matrix.shape[1]))
+    for i in range(matrix.shape[1]):
+        column = matrix[:, i]
+        valid = keep & ~np.isnan(column)
+        if valid.all():
+            group_codes = codes
+        else:
+            group_codes, column = codes[valid], column[valid]
+        sums[:, i] = np.bincount(group_codes, weights=column, minlength=n_groups)
+        counts[:, i] = np.bincount(group_codes, minlength=n_groups)
+    return uniques, sums, counts
+
+
+def group_mean(keys, matrix):
+    """Mean of each matrix column per key, skipping NaNs like DataFrame.groupby().mean()."""
+    uniques, sums, counts = group_totals(keys, matrix)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return uniques, sums / counts
+
+
+def aggregate(keys, matrix, key_name, columns):
+    index, means = group_mean(keys, matrix)
+    results = pd.DataFrame(means, columns=columns)
+    results.insert(0, key_name, index)
+    return results
+
+
+@profiled
+def calculate_mpi(merged, decays=DECAY_PARAMS):
+    """Normalised MPI per market and per border for every decay parameter.
+
+    `merged` is the MAIN x MARKETS table with `route_length_km`, `POP2020`,
+    `MARKETID` and `BorderID` columns.
+    """
+    matrix = mpi_matrix(merged['route_length_km'], merged['POP2020'], decays)
+    norm = normalise(matrix)
+    columns = [f'Norm_MPI_{j}' for j in decays]
+    mpi_market_results = aggregate(merged['MARKETID'].to_numpy(), norm, 'MARKETID', columns)
+    mpi_border_results = aggregate(merged['BorderID'].to_numpy(), norm, 'BorderID', columns)
+    return mpi_market_results, mpi_border_results
+
+
+# Columns of the distinct-route table behind the app's scenario calculator
+ROUTE_COLUMNS = ['MARKETID', 'BorderID', 'Type', 'route_length_km', 'POP2020']
+
+
+def route_table(merged):
+    """Distinct routes of `merged` with how often each occurs (`weight`).
+
+    Weighting each distinct route by its count gives the same normalised
+    means as `calculate_mpi` over the full, year-repeated table.
+    """
+    routes = merged.reindex(columns=ROUTE_COLUMNS)
+    return routes.groupby(ROUTE_COLUMNS, dropna=False, sort=False).size().rename('weight').reset_index()
+
+
+def scenario_mpi(route_length_km, population, weight, border_codes, n_borders, decay, keep=None):
+    """Normalised border MPI for one decay over a weighted route table, with only the `keep` routes open.
+
+    A single-decay, weighted form of `calculate_mpi`: normalisation uses the
+    min and max of the open routes, and each border's MPI is the weighted
+    mean over its open routes (NaN when none are left).
+    """
+    value = np.exp(-decay * route_length_km)
+    value *= population
+    if keep is not None:
+        value[~keep] = np.nan
+    low, high = np.nanmin(value), np.nanmax(value)
+    valid = ~np.isnan(value)
+    norm = (value[valid] - low) / (high - low)
+    sums = np.bincount(border_codes[valid], weights=norm * weight[valid], minlength=n_borders)
+    counts = np.bincount(border_codes[valid], weights=weight[valid], minlength=n_borders)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / counts
+
+
+# Out-of-core MPI over a route table streamed in batches
+def _batch_matrix(routes, population, decays):
+    return mpi_matrix(routes['route_length'] / 1000, routes['MARKETID'].map(population), decays)
+
+
+def _add_totals(totals, keys, norm):
+    index, sums, counts = group_totals(keys, norm)
+    part = pd.DataFrame(np.hstack([sums, counts]), index=index)
+    return part if totals is None else totals.add(part, fill_value=0)
+
+
+def _mean_table(totals, key_name, columns):
+    totals = totals.sort_index()
+    sums, counts = np.hsplit(totals.to_numpy(), 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        results = pd.DataFrame(sums / counts, columns=columns)
+    results.insert(0, key_name, totals.index.to_numpy())
+    return results
+
+
+@profiled
+def stream_mpi(routes_path, markets, decays=DECAY_PARAMS, chunk_rows=1_000_000):
+    """`calculate_mpi` over a CSV or Parquet route table too large for memory.
+
+    Routes (`MARKETID`, `BorderID`, `route_length` in metres) are read in
+    batches twice: the first pass finds the global min and max per decay,
+    the second normalises each batch and adds it to running per-market and
+    per-border sums and counts. Only `markets` (`MARKETID`, `POP2020`) is
+    held in memory.
+    """
+    population = markets.drop_duplicates('MARKETID').set_index('MARKETID')['POP2020']
+    columns = ['MARKETID', 'BorderID', 'route_length']
+
+    low = np.full(len(decays), np.inf)
+    high = np.full(len(decays), -np.inf)
+    for routes in iter_chunks(routes_path, columns=columns, chunk_rows=chunk_rows):
+        matrix = _batch_matrix(routes, population, decays)
+        low = np.fmin(low, np.fmin.reduce(matrix, axis=0))
+        high = np.fmax(high, np.fmax.reduce(matrix, axis=0))
+
+    market_totals = border_totals = None
+    for routes in iter_chunks(routes_path, columns=columns, chunk_rows=chunk_rows):
+        norm = _batch_matrix(routes, population, decays)
+        norm -= low
+        norm /= high - low
+        market_totals = _add_totals(market_totals, routes['MARKETID'].to_numpy(), norm)
+        border_totals = _add_totals(border_totals, routes['BorderID'].to_numpy(), norm)
+
+    columns = [f'Norm_MPI_{j}' for j in decays]
+    return _mean_table(market_totals, 'MARKETID', columns), _mean_table(border_totals, 'BorderID', columns)
+
+
+# Decay Sensitivity Sweep
+_sweep_inputs = {}
+
+
+def decay_grid(start=0.001, stop=0.2, num=200):
+    return np.round(np.linspace(start, stop, num), 6)
+
+
+def _init_sweep_worker(route_length_km, population, market_ids, border_ids):
+    _sweep_inputs.update(
+        route_length_km=route_length_km,
+        population=population,
+        market_ids=market_ids,
+        border_ids=border_ids,
+    )
+
+
+def _sweep_chunk(decays):
+    # Normalisation is per decay column, so each chunk of the grid is independent
+    norm = normalise(mpi_matrix(_sweep_inputs['route_length_km'], _sweep_inputs['population'], decays))
+    _, market_means = group_mean(_sweep_inputs['market_ids'], norm)
+    _, border_means = group_mean(_sweep_inputs['border_ids'], norm)
+    return market_means.astype(np.float32), border_means.astype(np.float32)
+
+
+@profiled
+def sweep_mpi(merged, decays, chunk_size=25, max_workers=None):
+    """Norm_MPI for every decay in `decays`, computed in chunks on a process pool.
+
+    Returns market and border cubes (ids x decays, float32) with their row ids.
+    """
+    inputs = (
+        merged['route_length_km'].to_numpy(dtype=np.float64),
+        merged['POP2020'].to_numpy(dtype=np.float64),
+        merged['MARKETID'].to_numpy(),
+        merged['BorderID'].to_numpy(),
+    )
+    decays = np.asarray(decays, dtype=np.float64)
+    chunks = [decays[i:i + chunk_size] for i in range(0, len(decays), chunk_size)]
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_sweep_worker, initargs=inputs) as pool:
+        results = list(pool.map(_sweep_chunk, chunks))
+
+    market_ids = pd.factorize(inputs[2], sort=True)[1]
+    border_ids = pd.factorize(inputs[3], sort=True)[1]
+    return {
+        'decays': decays,
+        'market_ids': market_ids,
+        'market_cube': np.hstack([market for market, _ in results]),
+        'border_ids': border_ids,
+        'border_cube': np.hstack([border for _, border in results]),
+    }
+
+
+def save_sweep(sweep, output_dir):
+    """Store each sweep array as .npy so it can be memory-mapped by the app."""
+    save_arrays(sweep, output_dir)
+
+
+def load_sweep(output_dir, mmap_mode='r'):
+    return load_arrays(output_dir, SWEEP_ARRAYS, mmap_mode)
+
+
+def load_merged_routes(file_path):
+    """MAIN route rows merged with MARKETS, as used by Layer 1."""
+    sheets = load_workbook(file_path)
+    main, markets = sheets['MAIN'], sheets['MARKETS']
+    merged = pd.merge(main, markets, on='MARKETID', how='left')
+    merged['route_length_km'] = merged['route_length'] / 1000
+    return merged
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Decay-parameter sensitivity sweep for the MPI.')
+    parser.add_argument('--workbook', default='data/MastersheetV3.xlsx')
+    parser.add_argument('--output', default='data/mpi_sweep')
+    parser.add_argument('--start', type=float, default=0.001)
+    parser.add_argument('--stop', type=float, default=0.2)
+    parser.add_argument('--num', type=int, default=200)
+    parser.add_argument('--chunk-size', type=int, default=25)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    sweep = sweep_mpi(
+        load_merged_routes(args.workbook),
+        decay_grid(args.start, args.stop, args.num),
+        chunk_size=args.chunk_size,
+        max_workers=args.workers,
+    )
+    save_sweep(sweep, args.output)
+    print(f"MPI sweep over {args.num} decay values saved in: {args.output}")
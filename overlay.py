@@ -0,0 +1,84 @@
+import os
+
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+import shapely
+
+from ingest import file_hash
+from profiling import profiled
+
+# Bounding box for Kenya and Uganda (min lon, min lat, max lon, max lat)
+KENYA_UGANDA_BBOX = (29, -5, 42, 5)
+
+
+@profiled
+def borders_to_gdf(borders):
+    return gpd.GeoDataFrame(
+        borders,
+        geometry=gpd.points_from_xy(borders['Longitude'], borders['Latitude']),
+        crs="EPSG:4326"
+    )
+
+
+def indexed_ethnic_path(ethnic_path, cache_dir=None):
+    """GeoParquet copy of the ethnographic layer, keyed by the source file's content hash."""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(ethnic_path)), 'cache')
+    return os.path.join(cache_dir, f'{file_hash(ethnic_path)}.parquet')
+
+
+@profiled
+def build_indexed_ethnic(ethnic_path, indexed_path, row_group_size=10_000):
+    """Convert the source layer once to GeoParquet with per-row bbox columns.
+
+    Features are written in Hilbert order so each row group covers a compact
+    area and its bbox statistics let readers skip row groups outside a query.
+    """
+    data = gpd.read_file(ethnic_path).to_crs(epsg=4326)
+    data = data.iloc[np.argsort(data.geometry.hilbert_distance(), kind='stable')]
+    os.makedirs(os.path.dirname(indexed_path), exist_ok=True)
+    tmp_path = indexed_path + '.tmp'
+    data.to_parquet(tmp_path, index=False, write_covering_bbox=True, row_group_size=row_group_size)
+    os.replace(tmp_path, indexed_path)
+
+
+@profiled
+def load_ethnic_data(ethnic_path, bbox=KENYA_UGANDA_BBOX, cache_dir=None):
+    """Ethnographic features within the study region, in WGS84.
+
+    Only the features whose bounding box meets `bbox` are read from disk.
+    """
+    indexed_path = indexed_ethnic_path(ethnic_path, cache_dir)
+    if not os.path.exists(indexed_path):
+        build_indexed_ethnic(ethnic_path, indexed_path)
+    return gpd.read_parquet(indexed_path, bbox=tuple(bbox)).drop(columns='bbox', errors='ignore')
+
+
+def intersecting_pairs(polygons, points):
+    """(polygon, point) index pairs where the geometries intersect.
+
+    The points go in an STRtree and each polygon is tested in prepared form.
+    """
+    polygons = np.asarray(polygons)
+    shapely.prepare(polygons)
+    tree = shapely.STRtree(np.asarray(points))
+    polygon_idx, point_idx = tree.query(polygons, predicate='intersects')
+    order = np.lexsort((point_idx, polygon_idx))
+    return polygon_idx[order], point_idx[order]
+
+
+@profiled
+def ethnic_mpi_overlay(ethnic_data, borders_gdf, mpi_border_results, mpi_columns):
+    """Ethnic features intersecting border posts, with the posts' MPI values."""
+    polygon_idx, point_idx = intersecting_pairs(ethnic_data.geometry.values, borders_gdf.geometry.values)
+    left = ethnic_data.iloc[polygon_idx].reset_index(drop=True)
+    right = pd.DataFrame(borders_gdf.drop(columns=borders_gdf.geometry.name)).iloc[point_idx]
+    right = right.reset_index(names='index_right').reset_index(drop=True)
+    overlay = left.join(right, lsuffix='_left', rsuffix='_right')
+    return pd.merge(
+        overlay,
+        mpi_border_results[['BorderID'] + mpi_columns],
+        on='BorderID',
+        how='left'
+    )
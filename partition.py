@@ -0,0 +1,190 @@
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ci import calculate_ci
+from exposure import EVENT_COLUMNS, EXPOSURE_DECAY, EXPOSURE_RADIUS_KM, conflict_exposure, straight_routes
+from ingest import iter_chunks, table_columns
+from mpi import DECAY_PARAMS, calculate_mpi
+from profiling import profiled
+
+# One row per border pair (region), with its bounding box in WGS84
+REGION_COLUMNS = ['region', 'lon_min', 'lat_min', 'lon_max', 'lat_max']
+
+KM_PER_DEGREE = 111.32
+
+# Tables every run writes, even when no region has a border post
+PARTITION_TABLES = ['mpi_market_results', 'mpi_border_results', 'ci_results']
+
+_shared = {}
+
+
+def read_regions(path):
+    regions = pd.read_csv(path)
+    missing = set(REGION_COLUMNS) - set(regions.columns)
+    if missing:
+        raise KeyError(f"The region table is missing the columns {sorted(missing)}.")
+    if regions['region'].duplicated().any():
+        raise ValueError("Region names must be unique.")
+    return regions[REGION_COLUMNS]
+
+
+def region_bboxes(regions):
+    return {row.region: (row.lon_min, row.lat_min, row.lon_max, row.lat_max) for row in regions.itertuples()}
+
+
+def in_bbox(longitude, latitude, bbox):
+    lon_min, lat_min, lon_max, lat_max = bbox
+    return (longitude >= lon_min) & (longitude <= lon_max) & (latitude >= lat_min) & (latitude <= lat_max)
+
+
+def pad_bbox(bbox, radius_km):
+    """`bbox` grown by `radius_km` on every side, so events near its edge are kept."""
+    lon_min, lat_min, lon_max, lat_max = bbox
+    dlat = radius_km / KM_PER_DEGREE
+    dlon = dlat / np.cos(np.radians(min(max(abs(lat_min), abs(lat_max)) + dlat, 89)))
+    return lon_min - dlon, lat_min - dlat, lon_max + dlon, lat_max + dlat
+
+
+def split_sheets(sheets, bbox):
+    """Border posts inside `bbox`, their MAIN routes and the markets those routes reach."""
+    borders = sheets['BORDERS']
+    borders = borders[in_bbox(borders['Longitude'], borders['Latitude'], bbox)]
+    main = sheets['MAIN'][sheets['MAIN']['BorderID'].isin(borders['BorderID'])]
+    markets = sheets['MARKETS'][sheets['MARKETS']['MARKETID'].isin(main['MARKETID'])]
+    return {'BORDERS': borders, 'MAIN': main, 'MARKETS': markets}
+
+
+def region_extent(sheets):
+    """Bounding box of a region's border posts and of the markets their routes reach."""
+    longitude = np.concatenate([sheets['BORDERS']['Longitude'], sheets['MARKETS']['Longitude']])
+    latitude = np.concatenate([sheets['BORDERS']['Latitude'], sheets['MARKETS']['Latitude']])
+    return np.nanmin(longitude), np.nanmin(latitude), np.nanmax(longitude), np.nanmax(latitude)
+
+
+@profiled
+def split_events(events_path, extents, output_dir, radius_km=EXPOSURE_RADIUS_KM, chunk_rows=1_000_000):
+    """Stream the ACLED export once and write each region's events to its own Parquet file.
+
+    A region keeps the events within `radius_km` of its extent (see
+    `region_extent`), so no post or route corridor loses nearby events.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    columns = EVENT_COLUMNS + (['event_date'] if 'event_date' in table_columns(events_path) else [])
+    padded = {region: pad_bbox(extent, radius_km) for region, extent in extents.items()}
+    paths = {region: os.path.join(output_dir, f'events_{region}.parquet') for region in extents}
+    os.makedirs(output_dir, exist_ok=True)
+
+    writers = {}
+    try:
+        for events in iter_chunks(events_path, columns=columns, chunk_rows=chunk_rows):
+            # Fixed dtypes so every chunk matches the schema of the first
+            events = events.astype({'year': 'float64', 'latitude': 'float64', 'longitude': 'float64',
+                                    'fatalities': 'float64'})
+            if 'event_date' in events.columns:
+                events['event_date'] = events['event_date'].astype('string')
+            for region, bbox in padded.items():
+                table = pa.Table.from_pandas(
+                    events[in_bbox(events['longitude'], events['latitude'], bbox)], preserve_index=False
+                )
+                if region not in writers:
+                    writers[region] = pq.ParquetWriter(paths[region], table.schema)
+                writers[region].write_table(table)
+    finally:
+        for writer in writers.values():
+            writer.close()
+    return paths
+
+
+def _init_worker(sheets, config, event_paths):
+    _shared.update(sheets=sheets, config=config, event_paths=event_paths)
+
+
+def with_names(results, borders):
+    return pd.merge(results, borders[['BorderID', 'Border_Name', 'Longitude', 'Latitude']], on='BorderID', how='left')
+
+
+def run_partition(region, bbox):
+    """Layers 1-3 for one region; every table gets a `region` column."""
+    config = _shared['config']
+    decays = config.get('decays', DECAY_PARAMS)
+    sheets = split_sheets(_shared['sheets'], bbox)
+    borders = sheets['BORDERS'].drop_duplicates('BorderID')
+    if borders.empty:
+        return {}
+    tables = {}
+
+    # Layer 1, normalised within the region as if it were run on its own
+    merged = pd.merge(sheets['MAIN'], sheets['MARKETS'], on='MARKETID', how='left')
+    merged['route_length_km'] = merged['route_length'] / 1000
+    mpi_market_results, mpi_border_results = calculate_mpi(merged, decays)
+    tables['mpi_market_results'] = mpi_market_results
+    tables['mpi_border_results'] = with_names(mpi_border_results, borders).dropna(subset=['Border_Name'])
+
+    # Layer 2
+    tables['ci_results'] = with_names(calculate_ci(sheets['MAIN']), borders)
+    if region in _shared['event_paths']:
+        routes = straight_routes(sheets['MAIN'], sheets['MARKETS'], borders)
+        tables['border_exposure'], tables['route_exposure'] = conflict_exposure(
+            _shared['event_paths'][region], borders, routes,
+            config.get('exposure_radius_km', EXPOSURE_RADIUS_KM), config.get('exposure_decay', EXPOSURE_DECAY)
+        )
+
+    # Layer 3
+    if config.get('ethnic'):
+        from overlay import borders_to_gdf, ethnic_mpi_overlay, load_ethnic_data
+
+        overlay = ethnic_mpi_overlay(
+            load_ethnic_data(config['ethnic'], bbox), borders_to_gdf(borders), tables['mpi_border_results'],
+            [f'Norm_MPI_{j}' for j in decays]
+        )
+        tables['mpi_summary'] = overlay.groupby('name', as_index=False)[[f'Norm_MPI_{j}' for j in decays]].mean()
+
+    for table in tables.values():
+        table.insert(0, 'region', region)
+    return tables
+
+
+@profiled
+def run_partitions(sheets, regions, config, work_dir, max_workers=None):
+    """Run Layers 1-3 for every region on a process pool and merge the results.
+
+    The workbook sheets are parsed once and handed to each worker at start-up;
+    events are split into per-region files in one pass over the export.
+    Returns one unified table per output (e.g. `mpi_border_results`).
+    """
+    bboxes = region_bboxes(regions)
+    splits = {region: split_sheets(sheets, bbox) for region, bbox in bboxes.items()}
+    # A region without border posts has no routes to compute layers for
+    empty = [region for region, split in splits.items() if split['BORDERS'].empty]
+    if empty:
+        warnings.warn(f"No border post lies in the bounding box of region(s) {empty}; they are left out.")
+        bboxes = {region: bbox for region, bbox in bboxes.items() if region not in empty}
+    event_paths = {}
+    if config.get('events') and bboxes:
+        extents = {region: region_extent(splits[region]) for region in bboxes}
+        event_paths = split_events(config['events'], extents, work_dir,
+                                   config.get('exposure_radius_km', EXPOSURE_RADIUS_KM))
+    if config.get('ethnic'):
+        from overlay import build_indexed_ethnic, indexed_ethnic_path
+
+        # Build the spatially indexed copy once, before the workers read it
+        indexed_path = indexed_ethnic_path(config['ethnic'])
+        if not os.path.exists(indexed_path):
+            build_indexed_ethnic(config['ethnic'], indexed_path)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(sheets, config, event_paths)) as pool:
+        results = list(pool.map(run_partition, bboxes, bboxes.values()))
+
+    names = dict.fromkeys(PARTITION_TABLES + [name for tables in results for name in tables])
+    merged = {}
+    for name in names:
+        parts = [tables[name] for tables in results if name in tables]
+        merged[name] = pd.concat(parts, ignore_index=True) if parts else pd.DataFrame(columns=['region'])
+    return merged
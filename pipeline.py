@@ -0,0 +1,600 @@
+import argparse
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+from collections import namedtuple
+from datetime import datetime, timezone
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import pandas as pd
+
+from ingest import file_hash, load_workbook, table_columns
+from mpi import DECAY_PARAMS, calculate_mpi, route_table, stream_mpi
+from profiling import profile_to, profiled, write_run_log
+
+# A pipeline stage: the workbook sheets and input files it reads, the stages it
+# depends on, the config values that parameterise it and the files it writes.
+Stage = namedtuple('Stage', ['name', 'func', 'sheets', 'files', 'deps', 'params', 'outputs'])
+
+MANIFEST = '.stage.json'
+
+# Per-stage span files written with --profile, merged into run_log.json
+PROFILE_DIR = 'profile'
+
+# Sub-annual CI cubes written by the exposure stage, by pandas frequency
+CUBE_FREQUENCIES = {'monthly': 'M', 'weekly': 'W'}
+
+# Project modules each stage runs code from (directly or through another listed module); their
+# source is part of the stage's cache key, so a fix in e.g. mpi.py re-runs the stages that use it
+STAGE_MODULES = {
+    'routes': ['routing'],
+    'catchments': ['catchment', 'mpi', 'ingest'],
+    'coverage': ['catchment', 'mpi', 'ingest'],
+    'mpi': ['mpi', 'ingest'],
+    'ci': ['ci', 'ingest'],
+    'exposure': ['exposure', 'ci', 'ingest'],
+    'partitions': ['partition', 'mpi', 'ci', 'exposure', 'overlay', 'catchment', 'ingest'],
+    'uncertainty': ['uncertainty', 'mpi', 'ingest'],
+    'map': ['map_layers', 'catchment', 'mpi', 'ci', 'ingest'],
+    'figures': ['figures'],
+    'overlay': ['overlay', 'ingest'],
+    'summaries': [],
+}
+
+
+def stage_path(config, stage, filename):
+    return os.path.join(config['output'], stage, filename)
+
+
+def has_event_dates(config):
+    # The sub-annual cubes need an event_date column, which --events does not require
+    return 'event_date' in table_columns(config['events'])
+
+
+def mpi_columns(config):
+    return [f'Norm_MPI_{j}' for j in config['decays']]
+
+
+@profiled
+def write_csv(table, path):
+    table.to_csv(path, index=False)
+
+
+@profiled
+def write_geojson(table, path):
+    table.to_file(path, driver="GeoJSON")
+
+
+# Road network distances from every market to every border post
+def run_routes(config, output_dir):
+    import numpy as np
+    from routing import build_road_graph, distance_matrix, read_table, route_lengths
+
+    sheets = load_workbook(config['workbook'])
+    markets, borders = sheets['MARKETS'], sheets['BORDERS']
+    nodes = read_table(config['road_nodes'])
+    graph = build_road_graph(read_table(config['roads']), nodes)
+    distances = distance_matrix(graph, nodes, markets, borders)
+
+    np.savez(os.path.join(output_dir, 'distance_matrix.npz'),
+             distances=distances, market_ids=markets['MARKETID'].to_numpy(), border_ids=borders['BorderID'].to_numpy())
+    write_csv(route_lengths(distances, markets['MARKETID'], borders['BorderID']),
+              os.path.join(output_dir, 'route_lengths.csv'))
+
+
+# Population captured by each market's urban/rural catchment
+def run_catchments(config, output_dir):
+    from catchment import assign_population
+
+    markets = load_workbook(config['workbook'])['MARKETS']
+    market_population = assign_population(markets, config['population'], overlap=config['overlap'])
+    write_csv(market_population, os.path.join(output_dir, 'market_population.csv'))
+
+
+# Radius sensitivity of market catchments
+def run_coverage(config, output_dir):
+    from catchment import coverage_curves
+
+    markets = load_workbook(config['workbook'])['MARKETS']
+    curves = coverage_curves(markets, config['population'], config['coverage_radii'])
+    write_csv(curves, os.path.join(output_dir, 'coverage_curves.csv'))
+
+
+# Layer 1: Market Potential Index
+def layer1_markets(config, sheets):
+    # Catchment population, when computed, replaces the workbook's POP2020
+    markets = sheets['MARKETS']
+    if config.get('population'):
+        market_population = pd.read_csv(stage_path(config, 'catchments', 'market_population.csv'))
+        markets = markets.assign(POP2020=markets['MARKETID'].map(market_population.set_index('MARKETID')['population']))
+    return markets
+
+
+@profiled
+def merged_routes(config, sheets):
+    """MAIN x MARKETS route table used by Layer 1, with `route_length_km`."""
+    # Route lengths come from the MAIN sheet, or from the road network when one is given
+    if config.get('roads'):
+        routes = pd.read_csv(stage_path(config, 'routes', 'route_lengths.csv'))
+    else:
+        routes = sheets['MAIN']
+
+    # Merge route length data with MARKETS
+    merged = pd.merge(routes, layer1_markets(config, sheets), on='MARKETID', how='left')
+    merged['route_length_km'] = merged['route_length'] / 1000
+    return merged
+
+
+def run_mpi(config, output_dir):
+    sheets = load_workbook(config['workbook'])
+    borders = sheets['BORDERS']
+
+    # A route table too large for memory is streamed in batches instead of merged
+    if config.get('routes_table'):
+        mpi_market_results, mpi_border_results = stream_mpi(
+            config['routes_table'], layer1_markets(config, sheets), config['decays']
+        )
+    else:
+        merged = merged_routes(config, sheets)
+        mpi_market_results, mpi_border_results = calculate_mpi(merged, config['decays'])
+        # Distinct weighted routes for the app's live scenario calculator
+        route_table(merged).to_parquet(os.path.join(output_dir, 'mpi_routes.parquet'), index=False)
+
+    # Merge MPI Results with Borders Data, dropping borders without a name
+    mpi_border_results = pd.merge(
+        mpi_border_results,
+        borders[['BorderID', 'Border_Name', 'Longitude', 'Latitude']],
+        on='BorderID',
+        how='left'
+    )
+    mpi_border_results = mpi_border_results.dropna(subset=['Border_Name'])
+
+    write_csv(mpi_market_results, os.path.join(output_dir, 'mpi_market_results.csv'))
+    write_csv(mpi_border_results, os.path.join(output_dir, 'mpi_border_results.csv'))
+
+
+# Layer 2: Conflict Exposure Index
+def run_ci(config, output_dir):
+    from ci import annual_cube, calculate_ci, changed_years, save_cube, update_ci, year_hashes
+
+    sheets = load_workbook(config['workbook'])
+    main_conflict = sheets['MAIN']
+    results_path = os.path.join(output_dir, 'ci_results.csv')
+    hashes_path = os.path.join(output_dir, 'ci_year_hashes.json')
+    hashes = {'code': stage_code_hash('ci', run_ci), 'years': year_hashes(main_conflict)}
+    stored = {}
+    if os.path.exists(hashes_path):
+        with open(hashes_path) as f:
+            stored = json.load(f)
+
+    # Incremental mode: only the years whose MAIN rows changed are recomputed, as long as the CI code is the
+    # one the stored results were computed with
+    if not config.get('force') and os.path.exists(results_path) and stored.get('code') == hashes['code']:
+        years = changed_years(stored['years'], hashes['years'])
+        ci_results = update_ci(pd.read_csv(results_path), main_conflict, years)
+        print(f"[ci] recomputed years: {years}")
+    else:
+        ci_results = calculate_ci(main_conflict)
+
+    ci_results = pd.merge(
+        ci_results,
+        sheets['BORDERS'][['BorderID', 'Border_Name', 'Longitude', 'Latitude']],
+        on='BorderID',
+        how='left'
+    )
+    write_csv(ci_results, results_path)
+    save_cube(annual_cube(ci_results), os.path.join(output_dir, 'ci_cube'))
+    with open(hashes_path, 'w') as f:
+        json.dump(hashes, f, indent=2)
+
+
+# Layer 2: event-level exposure of border posts and route corridors
+def run_exposure(config, output_dir):
+    from ci import build_cube, save_cube
+    from exposure import border_exposure_series, conflict_exposure, straight_routes
+
+    sheets = load_workbook(config['workbook'])
+    if config.get('route_geometries'):
+        import geopandas as gpd
+
+        routes = gpd.read_file(config['route_geometries']).to_crs(epsg=4326)
+    else:
+        routes = straight_routes(sheets['MAIN'], sheets['MARKETS'], sheets['BORDERS'])
+
+    border_exposure, route_exposure = conflict_exposure(
+        config['events'], sheets['BORDERS'], routes, config['exposure_radius_km'], config['exposure_decay']
+    )
+    write_csv(border_exposure, os.path.join(output_dir, 'border_exposure.csv'))
+    write_csv(route_exposure, os.path.join(output_dir, 'route_exposure.csv'))
+
+    # Monthly and weekly border x time cubes for sub-annual monitoring
+    if not has_event_dates(config):
+        return
+    series = border_exposure_series(
+        config['events'], sheets['BORDERS'], CUBE_FREQUENCIES.values(),
+        config['exposure_radius_km'], config['exposure_decay']
+    )
+    for name, freq in CUBE_FREQUENCIES.items():
+        cells = series[freq]
+        # No event near a border post gives an empty cube rather than a range from NaT
+        if cells.empty:
+            bins = pd.PeriodIndex([], freq=freq)
+        else:
+            bins = pd.period_range(cells['period'].min(), cells['period'].max(), freq=freq)
+        save_cube(build_cube(cells, 'period', bins, sheets['BORDERS'], 'exposure'),
+                  os.path.join(output_dir, f'ci_cube_{name}'))
+
+
+# Monte Carlo uncertainty bands for Layers 1 and 2
+def run_uncertainty(config, output_dir):
+    from uncertainty import uncertainty_bands
+
+    sheets = load_workbook(config['workbook'])
+    names = sheets['BORDERS'][['BorderID', 'Border_Name']].drop_duplicates('BorderID')
+    mpi_bands, ci_bands = uncertainty_bands(
+        merged_routes(config, sheets), sheets['MAIN'], config['replicates'], config['decays'], config['seed'],
+        max_workers=config.get('workers')
+    )
+    write_csv(mpi_bands.merge(names, on='BorderID', how='left'), os.path.join(output_dir, 'mpi_border_bands.csv'))
+    write_csv(ci_bands.merge(names, on='BorderID', how='left'), os.path.join(output_dir, 'ci_bands.csv'))
+
+
+# Border, market, route and population hexagon layers for the app map
+def run_map(config, output_dir):
+    from map_layers import build_layers, population_hexes, save_layers
+
+    sheets = load_workbook(config['workbook'])
+    markets = layer1_markets(config, sheets)
+    layers = build_layers(
+        sheets['MAIN'], markets, sheets['BORDERS'],
+        pd.read_csv(stage_path(config, 'mpi', 'mpi_market_results.csv')),
+        pd.read_csv(stage_path(config, 'mpi', 'mpi_border_results.csv')),
+        pd.read_csv(stage_path(config, 'ci', 'ci_results.csv')),
+        config['decays']
+    )
+    layers['hexes'] = population_hexes(markets, config.get('population'), config['hex_size_km'])
+    save_layers(layers, os.path.join(output_dir, 'map_layers'))
+
+
+# Layers 1-3 for every border pair in the region table, merged into unified tables
+def run_partitions(config, output_dir):
+    from partition import read_regions, run_partitions
+
+    sheets = load_workbook(config['workbook'])
+    sheets = dict(sheets, MARKETS=layer1_markets(config, sheets))
+    tables = run_partitions(sheets, read_regions(config['regions']), config, os.path.join(output_dir, 'events'),
+                            config.get('workers'))
+    for name, table in tables.items():
+        write_csv(table, os.path.join(output_dir, f'{name}.csv'))
+
+
+# Layer 3: Ethnic overlay
+def run_overlay(config, output_dir):
+    from overlay import borders_to_gdf, ethnic_mpi_overlay, load_ethnic_data
+
+    sheets = load_workbook(config['workbook'])
+    ethnic_data = load_ethnic_data(config['ethnic'], config['bbox'])
+    write_geojson(ethnic_data, os.path.join(output_dir, 'kenya_uganda_ethnic.geojson'))
+
+    mpi_border_results = pd.read_csv(stage_path(config, 'mpi', 'mpi_border_results.csv'))
+    overlay = ethnic_mpi_overlay(ethnic_data, borders_to_gdf(sheets['BORDERS']), mpi_border_results, mpi_columns(config))
+    write_geojson(overlay, os.path.join(output_dir, 'ethnic_mpi_overlay.geojson'))
+
+
+def run_summaries(config, output_dir):
+    import geopandas as gpd
+
+    # Aggregate MPI values by ethnic group
+    overlay = gpd.read_file(stage_path(config, 'overlay', 'ethnic_mpi_overlay.geojson'))
+    mpi_summary = overlay.groupby('name')[mpi_columns(config)].mean()
+    mpi_summary.to_csv(os.path.join(output_dir, 'mpi_summary.csv'))
+
+
+def run_figures(config, output_dir):
+    from figures import render_all
+
+    manifest = render_all(
+        pd.read_csv(stage_path(config, 'mpi', 'mpi_border_results.csv')),
+        pd.read_csv(stage_path(config, 'ci', 'ci_results.csv')),
+        config['decays'],
+        output_dir,
+        config.get('workers'),
+        config.get('force', False)
+    )
+    rendered = [name for name, entry in manifest.items() if entry['status'] == 'rendered']
+    print(f"[figures] rendered {len(rendered)} of {len(manifest)}: {rendered}")
+
+
+def figure_outputs(config):
+    return (['figures.json', 'MPI_bar_chart.png', 'ci_temporal_trends.png', 'ci_heatmap.png']
+            + [f'MPI_heatmap_decay_{j}.png' for j in config['decays']])
+
+
+def build_stages(config):
+    stages = []
+    mpi_deps = []
+    mpi_files = ['routes_table'] if config.get('routes_table') else []
+    if config.get('roads'):
+        stages.append(Stage('routes', run_routes, ['MARKETS', 'BORDERS'], ['roads', 'road_nodes'], [], [],
+                            ['distance_matrix.npz', 'route_lengths.csv']))
+        mpi_deps.append('routes')
+    if config.get('population'):
+        stages.append(Stage('catchments', run_catchments, ['MARKETS'], ['population'], [], ['overlap'],
+                            ['market_population.csv']))
+        mpi_deps.append('catchments')
+        if config.get('coverage_radii'):
+            stages.append(Stage('coverage', run_coverage, ['MARKETS'], ['population'], [], ['coverage_radii'],
+                                ['coverage_curves.csv']))
+    stages += [
+        Stage('mpi', run_mpi, ['MAIN', 'MARKETS', 'BORDERS'], mpi_files, mpi_deps, ['decays'],
+              ['mpi_market_results.csv', 'mpi_border_results.csv'] + ([] if mpi_files else ['mpi_routes.parquet'])),
+        Stage('ci', run_ci, ['MAIN', 'BORDERS'], [], [], [],
+              ['ci_results.csv', 'ci_year_hashes.json', 'ci_cube/prefix.npy']),
+    ]
+    if config.get('events'):
+        route_sheets = [] if config.get('route_geometries') else ['MAIN', 'MARKETS']
+        route_files = ['route_geometries'] if config.get('route_geometries') else []
+        cube_files = [f'ci_cube_{name}/prefix.npy' for name in CUBE_FREQUENCIES] if has_event_dates(config) else []
+        stages.append(Stage('exposure', run_exposure, route_sheets + ['BORDERS'], ['events'] + route_files, [],
+                            ['exposure_radius_km', 'exposure_decay'],
+                            ['border_exposure.csv', 'route_exposure.csv'] + cube_files))
+    if config.get('regions'):
+        partition_files = ['regions'] + [key for key in ('events', 'ethnic') if config.get(key)]
+        partition_deps = ['catchments'] if config.get('population') else []
+        stages.append(Stage('partitions', run_partitions, ['MAIN', 'MARKETS', 'BORDERS'], partition_files,
+                            partition_deps, ['decays', 'exposure_radius_km', 'exposure_decay'],
+                            ['mpi_market_results.csv', 'mpi_border_results.csv', 'ci_results.csv']))
+    if config.get('replicates'):
+        stages.append(Stage('uncertainty', run_uncertainty, ['MAIN', 'MARKETS', 'BORDERS'], [], mpi_deps,
+                            ['decays', 'replicates', 'seed'], ['mpi_border_bands.csv', 'ci_bands.csv']))
+    map_deps = ['mpi', 'ci'] + (['catchments'] if config.get('population') else [])
+    map_files = ['population'] if config.get('population') else []
+    stages.append(Stage('map', run_map, ['MAIN', 'MARKETS', 'BORDERS'], map_files, map_deps, ['decays', 'hex_size_km'],
+                        [f'map_layers/{name}.parquet' for name in ('borders', 'markets', 'routes', 'hexes')]))
+    stages.append(Stage('figures', run_figures, [], [], ['mpi', 'ci'], ['decays'], figure_outputs(config)))
+    # Layer 3 needs the ethnographic layer, which is not shipped with the repo
+    if config.get('ethnic'):
+        stages += [
+            Stage('overlay', run_overlay, ['BORDERS'], ['ethnic'], ['mpi'], ['decays', 'bbox'],
+                  ['kenya_uganda_ethnic.geojson', 'ethnic_mpi_overlay.geojson']),
+            Stage('summaries', run_summaries, [], [], ['overlay'], ['decays'], ['mpi_summary.csv']),
+        ]
+    return {stage.name: stage for stage in stages}
+
+
+def sheet_hashes(sheets):
+    """Content hash per sheet, so editing one sheet only invalidates the stages that read it."""
+    hashes = {}
+    for name, df in sheets.items():
+        digest = hashlib.sha256(json.dumps([list(map(str, df.columns)), list(map(str, df.dtypes))]).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        hashes[name] = digest.hexdigest()
+    return hashes
+
+
+def pipeline_functions(func):
+    """`func` and the functions of this module it calls, directly or through one another."""
+    found, pending = {}, [func]
+    while pending:
+        func = inspect.unwrap(pending.pop())
+        if func.__name__ in found:
+            continue
+        found[func.__name__] = func
+        codes, names = [func.__code__], set()
+        while codes:
+            code = codes.pop()
+            names.update(code.co_names)
+            # Comprehensions and lambdas have code objects of their own
+            codes += [const for const in code.co_consts if inspect.iscode(const)]
+        pending += [value for value in map(globals().get, names)
+                    if inspect.isfunction(value) and value.__module__ == __name__]
+    return [found[name] for name in sorted(found)]
+
+
+def stage_code_hash(name, func):
+    """Hash of the stage function, the pipeline helpers it calls and the project modules it runs."""
+    digest = hashlib.sha256()
+    for helper in pipeline_functions(func):
+        digest.update(inspect.getsource(helper).encode())
+    for module in STAGE_MODULES[name]:
+        digest.update(file_hash(importlib.util.find_spec(module).origin).encode())
+    return digest.hexdigest()
+
+
+def stage_keys(stages, config, hashes):
+    """Cache key per stage from its code, sheets, files, parameters and upstream keys."""
+    keys = {}
+    for name in topological_order(stages):
+        stage = stages[name]
+        digest = hashlib.sha256(stage_code_hash(stage.name, stage.func).encode())
+        for sheet in stage.sheets:
+            digest.update(hashes[sheet].encode())
+        for key in stage.files:
+            digest.update(file_hash(config[key]).encode())
+        digest.update(json.dumps({p: config[p] for p in stage.params}, sort_keys=True).encode())
+        for dep in stage.deps:
+            digest.update(keys[dep].encode())
+        keys[name] = digest.hexdigest()
+    return keys
+
+
+def topological_order(stages):
+    order, seen = [], set()
+
+    def visit(name):
+        if name not in seen:
+            seen.add(name)
+            for dep in stages[name].deps:
+                visit(dep)
+            order.append(name)
+
+    for name in stages:
+        visit(name)
+    return order
+
+
+def is_cached(stage, config, key):
+    manifest_path = stage_path(config, stage.name, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    return manifest.get('key') == key and all(
+        os.path.exists(stage_path(config, stage.name, output)) for output in stage.outputs
+    )
+
+
+def execute_stage(stage, config, key):
+    output_dir = os.path.join(config['output'], stage.name)
+    os.makedirs(output_dir, exist_ok=True)
+    if config.get('profile'):
+        with profile_to(os.path.join(config['output'], PROFILE_DIR, f'{stage.name}.json'), stage.name,
+                        config.get('trace_allocations', False)):
+            stage.func(config, output_dir)
+    else:
+        stage.func(config, output_dir)
+    with open(os.path.join(output_dir, MANIFEST), 'w') as f:
+        json.dump({'key': key, 'outputs': stage.outputs}, f, indent=2)
+    return stage.name
+
+
+def run_pipeline(config, force=False, max_workers=None):
+    """Run every stage whose inputs changed; independent stages run concurrently."""
+    stages = build_stages(config)
+    profile = config.get('profile')
+    if profile:
+        profile_path = os.path.join(config['output'], PROFILE_DIR, 'pipeline.json')
+        with profile_to(profile_path, 'pipeline', config.get('trace_allocations', False)):
+            # Parse the workbook (or load it from the Parquet cache) before any stage runs
+            keys = stage_keys(stages, config, sheet_hashes(load_workbook(config['workbook'])))
+    else:
+        keys = stage_keys(stages, config, sheet_hashes(load_workbook(config['workbook'])))
+
+    done, running, ran = set(), {}, []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        while len(done) < len(stages):
+            for name in topological_order(stages):
+                stage = stages[name]
+                if name in done or name in running.values() or not set(stage.deps) <= done:
+                    continue
+                if not force and is_cached(stage, config, keys[name]):
+                    print(f"[{name}] up to date, skipped")
+                    done.add(name)
+                    continue
+                print(f"[{name}] running")
+                running[pool.submit(execute_stage, stage, config, keys[name])] = name
+
+            if not running:
+                continue
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                future.result()
+                print(f"[{name}] done")
+                done.add(name)
+                ran.append(name)
+
+    if profile:
+        write_profile(config, stages, ran)
+    return keys
+
+
+def write_profile(config, stages, ran):
+    """Merge the span files of this run into the run log and print the flame-style summary."""
+    spans = []
+    for name in ['pipeline'] + ran:
+        with open(os.path.join(config['output'], PROFILE_DIR, f'{name}.json')) as f:
+            spans += json.load(f)
+    meta = {
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'config': config,
+        'stages': {name: 'ran' if name in ran else 'skipped' for name in topological_order(stages)},
+    }
+    summary = write_run_log(os.path.join(config['output'], PROFILE_DIR), spans, meta)
+    print(summary)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run the borderland analysis layers as cached pipeline stages.')
+    parser.add_argument('--workbook', default='data/MastersheetV3.xlsx')
+    parser.add_argument('--ethnic', default=None, help='Ethnographic layer (e.g. EA202.geojson) for Layer 3')
+    parser.add_argument('--roads', default=None, help='Road edge list (u, v, length, oneway) to recompute route lengths')
+    parser.add_argument('--road-nodes', default=None, help='Road node table (osmid, x, y) for --roads')
+    parser.add_argument('--routes-table', default=None,
+                        help='Route table (MARKETID, BorderID, route_length) streamed in batches for Layer 1 instead of MAIN')
+    parser.add_argument('--population', default=None,
+                        help='Population points (x, y, population) to recompute market catchment population')
+    parser.add_argument('--overlap', choices=['all', 'nearest', 'split'], default='all',
+                        help='How population in overlapping catchments is counted')
+    parser.add_argument('--coverage-radii', type=float, nargs='+', default=None, metavar='METRES',
+                        help='Candidate catchment radii for population coverage curves (needs --population)')
+    parser.add_argument('--events', default=None, help='Raw ACLED event export (year, latitude, longitude, fatalities)')
+    parser.add_argument('--route-geometries', default=None,
+                        help='Route lines with a RouteID column; straight market-border lines are used otherwise')
+    parser.add_argument('--exposure-radius-km', type=float, default=20)
+    parser.add_argument('--exposure-decay', type=float, default=0.1)
+    parser.add_argument('--regions', default=None,
+                        help='Region table (region, lon_min, lat_min, lon_max, lat_max) to run Layers 1-3 per border pair')
+    parser.add_argument('--replicates', type=int, default=0,
+                        help='Monte Carlo replicates for MPI and CI uncertainty bands (0 to skip)')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the uncertainty replicates')
+    parser.add_argument('--hex-size-km', type=float, default=10,
+                        help='Edge length of the population hexagons on the app map')
+    parser.add_argument('--output', default='results')
+    parser.add_argument('--decays', type=float, nargs='+', default=DECAY_PARAMS)
+    # Kenya-Uganda study region by default
+    parser.add_argument('--bbox', type=float, nargs=4, default=[29, -5, 42, 5],
+                        metavar=('LON_MIN', 'LAT_MIN', 'LON_MAX', 'LAT_MAX'))
+    parser.add_argument('--force', action='store_true', help='Re-run every stage, ignoring the cache')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--profile', action='store_true',
+                        help='Record time, memory and row counts per stage in <output>/profile/run_log.json')
+    parser.add_argument('--trace-allocations', action='store_true',
+                        help='With --profile, also record tracemalloc peaks (slows Python-heavy stages)')
+    args = parser.parse_args(argv)
+    if args.roads and not args.road_nodes:
+        parser.error('--roads needs --road-nodes')
+    if args.roads and args.routes_table:
+        parser.error('--roads and --routes-table both replace the MAIN routes; pass only one')
+    if args.routes_table and args.replicates:
+        parser.error('--replicates resamples routes in memory and cannot be combined with --routes-table')
+    if args.coverage_radii and not args.population:
+        parser.error('--coverage-radii needs --population')
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = {
+        'workbook': args.workbook,
+        'ethnic': args.ethnic,
+        'roads': args.roads,
+        'road_nodes': args.road_nodes,
+        'routes_table': args.routes_table,
+        'population': args.population,
+        'overlap': args.overlap,
+        'coverage_radii': args.coverage_radii,
+        'events': args.events,
+        'route_geometries': args.route_geometries,
+        'exposure_radius_km': args.exposure_radius_km,
+        'exposure_decay': args.exposure_decay,
+        'regions': args.regions,
+        'replicates': args.replicates,
+        'seed': args.seed,
+        'hex_size_km': args.hex_size_km,
+        'output': args.output,
+        'decays': args.decays,
+        'bbox': args.bbox,
+        'force': args.force,
+        'workers': args.workers,
+        'profile': args.profile,
+        'trace_allocations': args.trace_allocations,
+    }
+    run_pipeline(config, force=args.force, max_workers=args.workers)
+    print(f"Results and visualizations saved in: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
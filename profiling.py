@@ -0,0 +1,194 @@
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Profiling is off unless a stage or script enables it; spans are then no-ops
+_state = {'enabled': False, 'stack': [], 'spans': []}
+
+
+def enable(trace_allocations=False):
+    """Start recording spans; `trace_allocations` adds tracemalloc peaks at a large speed cost."""
+    if trace_allocations and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _state.update(enabled=True, stack=[], spans=[])
+
+
+def disable():
+    _state['enabled'] = False
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+
+if hasattr(os, 'register_at_fork'):
+    # Pool workers forked from a profiled stage do not record spans or trace allocations
+    os.register_at_fork(after_in_child=disable)
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def count_rows(obj):
+    """Row count of a table-like result, the first item of a tuple, or the tables of a dict."""
+    if isinstance(obj, tuple) and obj:
+        return count_rows(obj[0])
+    if isinstance(obj, dict):
+        counts = [count_rows(value) for value in obj.values()]
+        return sum(counts) if counts and None not in counts else None
+    if hasattr(obj, 'shape') and len(getattr(obj, 'shape')):
+        return int(obj.shape[0])
+    return None
+
+
+@contextmanager
+def span(name, rows=None):
+    """Record wall and CPU time, memory and row counts for the enclosed block.
+
+    Yields the record so the block can fill in `rows` or `rows_out`. Spans
+    nest; each record keeps its `path` from the outermost span.
+    """
+    if not _state['enabled']:
+        yield {}
+        return
+
+    stack = _state['stack']
+    tracing = tracemalloc.is_tracing()
+    current, peak = tracemalloc.get_traced_memory()
+    if stack:
+        # The parent's peak so far is lost when the peak is reset for this span
+        stack[-1][1]['peak'] = max(stack[-1][1]['peak'], peak)
+    if tracing:
+        tracemalloc.reset_peak()
+    frame = {'peak': 0}
+    record = {'name': name, 'path': ';'.join([n for n, _ in stack] + [name]), 'depth': len(stack), 'rows': rows}
+    stack.append((name, frame))
+    blocks = sys.getallocatedblocks()
+    wall, cpu = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+        stack.pop()
+        peak = max(tracemalloc.get_traced_memory()[1], frame['peak'])
+        if stack:
+            stack[-1][1]['peak'] = max(stack[-1][1]['peak'], peak)
+        record.update(
+            wall_s=wall,
+            cpu_s=cpu,
+            alloc_peak_mb=(peak - current) / 1e6 if tracing else None,
+            alloc_blocks=sys.getallocatedblocks() - blocks,
+            peak_rss_mb=peak_rss_mb(),
+            pid=os.getpid(),
+        )
+        _state['spans'].append(record)
+
+
+def profiled(func):
+    """Run `func` in a span named after it when profiling is enabled."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not _state['enabled']:
+            return func(*args, **kwargs)
+        with span(func.__name__, rows=count_rows(args[0]) if args else None) as record:
+            result = func(*args, **kwargs)
+            record['rows_out'] = count_rows(result)
+        return result
+    return wrapper
+
+
+@contextmanager
+def profile_to(path, name, trace_allocations=False):
+    """Profile the enclosed block as root span `name` and write its spans as JSON to `path`."""
+    enable(trace_allocations)
+    try:
+        with span(name):
+            yield
+    finally:
+        spans = _state['spans']
+        disable()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(spans, f, indent=2)
+
+
+def self_times(spans):
+    """Wall time per span path minus the time of its direct children, summed over repeats."""
+    totals, children = {}, {}
+    for s in spans:
+        totals[s['path']] = totals.get(s['path'], 0) + s['wall_s']
+        parent = s['path'].rpartition(';')[0]
+        if parent:
+            children[parent] = children.get(parent, 0) + s['wall_s']
+    return {path: max(total - children.get(path, 0), 0) for path, total in totals.items()}
+
+
+def folded(spans):
+    """Collapsed-stack lines ("a;b;c <microseconds>") for flamegraph.pl or speedscope."""
+    return [f'{path} {round(seconds * 1e6)}' for path, seconds in self_times(spans).items()]
+
+
+def flame_summary(spans, width=40):
+    """Indented text tree of span paths with wall-time bars, slowest first within each parent."""
+    rows = {}
+    for s in spans:
+        row = rows.setdefault(s['path'], {'name': s['name'], 'depth': s['depth'], 'calls': 0, 'wall_s': 0, 'cpu_s': 0,
+                                          'alloc_peak_mb': None, 'alloc_blocks': 0, 'peak_rss_mb': 0, 'rows': None})
+        row['calls'] += 1
+        row['wall_s'] += s['wall_s']
+        row['cpu_s'] += s['cpu_s']
+        if s['alloc_peak_mb'] is not None:
+            row['alloc_peak_mb'] = max(row['alloc_peak_mb'] or 0, s['alloc_peak_mb'])
+        row['alloc_blocks'] += s['alloc_blocks']
+        row['peak_rss_mb'] = max(row['peak_rss_mb'], s['peak_rss_mb'] or 0)
+        count = s['rows'] if s.get('rows') is not None else s.get('rows_out')
+        if count is not None:
+            row['rows'] = (row['rows'] or 0) + count
+    if not rows:
+        return ''
+
+    def children(parent):
+        found = [p for p in rows if p.rpartition(';')[0] == parent]
+        return sorted(found, key=lambda p: -rows[p]['wall_s'])
+
+    longest = max(row['wall_s'] for row in rows.values()) or 1
+    lines = [f"{'span':<44} {'':<{width}} {'wall s':>9} {'cpu s':>9} {'alloc MB':>9} {'blocks':>10} {'rss MB':>8} "
+             f"{'rows':>11}"]
+
+    def walk(parent):
+        for path in children(parent):
+            row = rows[path]
+            label = '  ' * row['depth'] + row['name'] + (f" x{row['calls']}" if row['calls'] > 1 else '')
+            bar = '█' * max(1, round(width * row['wall_s'] / longest))
+            rows_text = f"{row['rows']:,}" if row['rows'] is not None else ''
+            alloc_text = f"{row['alloc_peak_mb']:.1f}" if row['alloc_peak_mb'] is not None else ''
+            lines.append(f"{label[:44]:<44} {bar:<{width}} {row['wall_s']:9.3f} {row['cpu_s']:9.3f} "
+                         f"{alloc_text:>9} {row['alloc_blocks']:10,} {row['peak_rss_mb']:8.0f} {rows_text:>11}")
+            walk(path)
+
+    walk('')
+    return '\n'.join(lines)
+
+
+def write_run_log(output_dir, spans, meta):
+    """Structured run log (run_log.json), collapsed stacks (profile.folded) and the text summary."""
+    with open(os.path.join(output_dir, 'run_log.json'), 'w') as f:
+        json.dump(dict(meta, spans=spans), f, indent=2, default=str)
+    with open(os.path.join(output_dir, 'profile.folded'), 'w') as f:
+        f.write('\n'.join(folded(spans)) + '\n')
+    summary = flame_summary(spans)
+    with open(os.path.join(output_dir, 'profile.txt'), 'w') as f:
+        f.write(summary + '\n')
+    return summary
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+from scipy.spatial import cKDTree
+
+from profiling import profiled
+
+# Approximate metres per degree, used to snap points to the road network
+METERS_PER_DEGREE_LAT = 110_540
+METERS_PER_DEGREE_LON = 111_320
+
+
+def read_table(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+
+# OSM `oneway` values; anything else, or missing, is a two-way road
+ONEWAY_FORWARD = {'yes', 'true', '1'}
+ONEWAY_REVERSE = {'-1', 'reverse'}
+
+
+def oneway_directions(oneway, n_edges):
+    """Masks of edges that are one-way u -> v and one-way v -> u (OSM `-1`).
+
+    Accepts OSM strings (`yes`, `no`, `-1`), booleans or numbers.
+    """
+    if oneway is None:
+        return np.zeros(n_edges, dtype=bool), np.zeros(n_edges, dtype=bool)
+    # Numeric columns read as 1.0 / -1.0
+    values = oneway.astype('string').str.strip().str.lower().str.replace(r'\.0+$', '', regex=True)
+    forward = values.isin(ONEWAY_FORWARD).fillna(False).to_numpy(dtype=bool)
+    reverse = values.isin(ONEWAY_REVERSE).fillna(False).to_numpy(dtype=bool)
+    return forward, reverse
+
+
+@profiled
+def build_road_graph(edges, nodes):
+    """CSR road graph from an OSM-style edge list.
+
+    `edges` has `u`, `v` and `length` (metres) with an optional OSM `oneway`
+    column; `nodes` has `osmid`, `x` (lon) and `y` (lat). Two-way edges are
+    added in both directions, `-1` edges from `v` to `u`, and only the
+    shortest of any parallel edges is kept.
+    """
+    index = pd.Index(nodes['osmid'].to_numpy())
+    u = index.get_indexer(edges['u'].to_numpy())
+    v = index.get_indexer(edges['v'].to_numpy())
+    if (u < 0).any() or (v < 0).any():
+        raise KeyError("The edge list references nodes that are missing from the node table.")
+
+    length = edges['length'].to_numpy(dtype=np.float64)
+    # csgraph treats explicit zeros as missing edges
+    length = np.maximum(length, 1e-9)
+    forward, reverse = oneway_directions(edges['oneway'] if 'oneway' in edges.columns else None, len(edges))
+
+    # Every edge but a reversed one runs u -> v; every edge but a forward one-way runs v -> u
+    src = np.concatenate([u[~reverse], v[~forward]])
+    dst = np.concatenate([v[~reverse], u[~forward]])
+    weight = np.concatenate([length[~reverse], length[~forward]])
+
+    # Sort by (src, dst, weight) and keep the first, i.e. shortest, parallel edge
+    order = np.lexsort((weight, dst, src))
+    src, dst, weight = src[order], dst[order], weight[order]
+    first = np.r_[True, (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])]
+    src, dst, weight = src[first], dst[first], weight[first]
+
+    n_nodes = len(index)
+    indptr = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=n_nodes), out=indptr[1:])
+    return csr_matrix((weight, dst, indptr), shape=(n_nodes, n_nodes))
+
+
+def snap_to_nodes(nodes, longitude, latitude):
+    """Nearest road node and the straight-line distance to it (metres) for each point."""
+    lat0 = np.cos(np.radians(nodes['y'].mean()))
+    node_xy = np.column_stack([
+        nodes['x'].to_numpy() * METERS_PER_DEGREE_LON * lat0,
+        nodes['y'].to_numpy() * METERS_PER_DEGREE_LAT,
+    ])
+    point_xy = np.column_stack([
+        np.asarray(longitude, dtype=np.float64) * METERS_PER_DEGREE_LON * lat0,
+        np.asarray(latitude, dtype=np.float64) * METERS_PER_DEGREE_LAT,
+    ])
+    snap_distance, node = cKDTree(node_xy).query(point_xy)
+    return node, snap_distance
+
+
+@profiled
+def distance_matrix(graph, nodes, markets, borders):
+    """Road distance (metres) from every market to every border post.
+
+    Runs Dijkstra from all border posts in one call on the CSR graph. The
+    straight-line distances from each market and post to its nearest road
+    node are added to the network distance. Unreachable pairs are inf.
+    """
+    market_node, market_snap = snap_to_nodes(nodes, markets['Longitude'], markets['Latitude'])
+    border_node, border_snap = snap_to_nodes(nodes, borders['Longitude'], borders['Latitude'])
+
+    # The road graph may be directed, so search backwards from the posts on the transposed graph
+    sources, inverse = np.unique(border_node, return_inverse=True)
+    from_borders = dijkstra(graph.T.tocsr(), directed=True, indices=sources)
+    network = from_borders[inverse][:, market_node].T
+    return network + market_snap[:, None] + border_snap[None, :]
+
+
+def route_lengths(distances, market_ids, border_ids):
+    """Long market x border table with a `route_length` column, as in the MAIN sheet."""
+    table = pd.DataFrame({
+        'MARKETID': np.repeat(np.asarray(market_ids), len(border_ids)),
+        'BorderID': np.tile(np.asarray(border_ids), len(market_ids)),
+        'route_length': distances.ravel(),
+    })
+    # Pairs with no road connection have no route
+    return table[np.isfinite(table['route_length'])].reset_index(drop=True)
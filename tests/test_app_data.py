@@ -0,0 +1,56 @@
+import os
+import zipfile
+
+import pandas as pd
+import pytest
+
+import app_data
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    # Paths are relative, so clear what an earlier test cached for data/ci_results.csv
+    app_data._static_download.clear()
+    app_data._static_bundle.clear()
+    os.makedirs(app_data.DATA_DIR)
+    table = pd.DataFrame({'BorderID': range(2000), 'CI': [0.5] * 2000})
+    table.to_csv(app_data.data_path('ci_results.csv'), index=False)
+    return tmp_path
+
+
+def test_static_download_under_limit(data_dir):
+    url = app_data.static_download('ci_results.csv', 'csv')
+    assert url.startswith('app/static/downloads/ci_results-') and url.endswith('.csv')
+    assert os.path.exists(os.path.join(app_data.DOWNLOAD_DIR, os.path.basename(url)))
+
+
+def test_static_download_over_limit_is_zipped(data_dir, monkeypatch):
+    size = os.path.getsize(app_data.data_path('ci_results.csv'))
+    monkeypatch.setattr(app_data, 'STATIC_FILE_LIMIT_BYTES', size // 2)
+    url = app_data.static_download('ci_results.csv', 'csv')
+    assert url.endswith('.csv.zip')
+    path = os.path.join(app_data.DOWNLOAD_DIR, os.path.basename(url))
+    assert os.path.getsize(path) <= size // 2
+    with zipfile.ZipFile(path) as bundle:
+        assert bundle.namelist() == ['ci_results.csv']
+    # The unzipped copy over the limit is not left behind to be served
+    assert not [name for name in os.listdir(app_data.DOWNLOAD_DIR) if name.endswith('.csv')]
+
+
+def test_static_download_over_limit_even_zipped(data_dir, monkeypatch):
+    monkeypatch.setattr(app_data, 'STATIC_FILE_LIMIT_BYTES', 10)
+    assert app_data.static_download('ci_results.csv', 'csv') is None
+    assert app_data.static_bundle(['ci_results.csv']) is None
+    assert os.listdir(app_data.DOWNLOAD_DIR) == []
+
+
+def test_band_decays_match_decay_options(monkeypatch):
+    from mpi import DECAY_PARAMS
+
+    monkeypatch.chdir(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    app_data._read_table.clear()
+    bands = app_data.load_table('mpi_border_bands.csv')
+    assert bands['decay'].dtype == 'float64'
+    assert bands['MPI_low'].dtype == 'float32'
+    assert bands['decay'].isin(DECAY_PARAMS).sum() == len(bands) > 0
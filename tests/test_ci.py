@@ -0,0 +1,68 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import ci
+import pipeline
+from ingest import load_workbook
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'MastersheetV3.xlsx')
+
+
+@pytest.fixture
+def config(tmp_path):
+    config = {'workbook': WORKBOOK, 'output': str(tmp_path)}
+    os.makedirs(tmp_path / 'ci')
+    pipeline.run_ci(config, str(tmp_path / 'ci'))
+    return config
+
+
+def run_ci(config):
+    pipeline.run_ci(config, os.path.join(config['output'], 'ci'))
+    return pd.read_csv(os.path.join(config['output'], 'ci', 'ci_results.csv'))
+
+
+def expected_ci(sheets):
+    return ci.calculate_ci(sheets['MAIN']).sort_values(['year', 'BorderID'], ignore_index=True)
+
+
+def assert_same_ci(results, expected):
+    results = results.sort_values(['year', 'BorderID'], ignore_index=True)
+    np.testing.assert_array_equal(results[['year', 'BorderID']], expected[['year', 'BorderID']])
+    np.testing.assert_allclose(results['CI'], expected['CI'], rtol=1e-12)
+
+
+def test_data_change_recomputes_only_changed_years(config, monkeypatch, capsys):
+    sheets = dict(load_workbook(WORKBOOK))
+    main = sheets['MAIN'].copy()
+    year = int(main['year'].max())
+    main.loc[main['year'] == year, 'fatalities'] += 3
+    sheets['MAIN'] = main
+    monkeypatch.setattr(pipeline, 'load_workbook', lambda path: sheets)
+    capsys.readouterr()
+
+    results = run_ci(config)
+    assert f'recomputed years: [{year}]' in capsys.readouterr().out
+    assert_same_ci(results, expected_ci(sheets))
+
+
+def test_code_change_recomputes_every_year(config, monkeypatch, capsys):
+    before = pd.read_csv(os.path.join(config['output'], 'ci', 'ci_results.csv'))
+    # A change to the CI code, as the stage code hash would see it
+    monkeypatch.setattr(ci, 'conflict_weight', lambda main: 2 * (main['fatalities'] + 0.5 * main['event_count']))
+    monkeypatch.setattr(pipeline, 'stage_code_hash', lambda name, func: 'changed')
+    capsys.readouterr()
+
+    results = run_ci(config)
+    assert 'recomputed years' not in capsys.readouterr().out
+    assert_same_ci(results, expected_ci(load_workbook(WORKBOOK)))
+    np.testing.assert_allclose(results['CI'].sum(), 2 * before['CI'].sum(), rtol=1e-9)
+
+
+def test_unchanged_inputs_recompute_nothing(config, capsys):
+    capsys.readouterr()
+    results = run_ci(config)
+    assert 'recomputed years: []' in capsys.readouterr().out
+    assert_same_ci(results, expected_ci(load_workbook(WORKBOOK)))
@@ -0,0 +1,75 @@
+from math import exp
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from mpi import DECAY_PARAMS, calculate_mpi, stream_mpi, sweep_mpi
+
+COLUMNS = [f'Norm_MPI_{j}' for j in DECAY_PARAMS]
+
+
+@pytest.fixture
+def merged():
+    rng = np.random.default_rng(7)
+    n = 400
+    markets = pd.DataFrame({'MARKETID': np.arange(1, 31), 'POP2020': rng.integers(500, 90_000, 30).astype(float)})
+    # A market without population contributes NaN rows, as in the workbook
+    markets.loc[4, 'POP2020'] = np.nan
+    routes = pd.DataFrame({
+        'MARKETID': rng.integers(1, 31, n),
+        'BorderID': rng.integers(1, 14, n),
+        'route_length': rng.uniform(500, 250_000, n),
+    })
+    merged = routes.merge(markets, on='MARKETID', how='left')
+    merged['route_length_km'] = merged['route_length'] / 1000
+    return merged
+
+
+def reference_mpi(merged):
+    """The original row-wise apply, normalisation and groupby means of the analysis script."""
+    merged = merged.copy()
+    for j in DECAY_PARAMS:
+        merged[f'MPI_{j}'] = merged.apply(lambda row: exp(-j * row['route_length_km']) * row['POP2020'], axis=1)
+    for j in DECAY_PARAMS:
+        col = f'MPI_{j}'
+        merged[f'Norm_MPI_{j}'] = (merged[col] - merged[col].min()) / (merged[col].max() - merged[col].min())
+    return (merged.groupby('MARKETID')[COLUMNS].mean().reset_index(),
+            merged.groupby('BorderID')[COLUMNS].mean().reset_index())
+
+
+def assert_same_results(results, expected, key):
+    results = results.sort_values(key, ignore_index=True)
+    expected = expected.sort_values(key, ignore_index=True)
+    np.testing.assert_array_equal(results[key], expected[key])
+    np.testing.assert_allclose(results[COLUMNS].to_numpy(dtype=np.float64), expected[COLUMNS].to_numpy(),
+                               rtol=1e-12, atol=1e-15)
+
+
+def test_calculate_mpi_matches_groupby_apply(merged):
+    market, border = calculate_mpi(merged)
+    expected_market, expected_border = reference_mpi(merged)
+    assert_same_results(market, expected_market, 'MARKETID')
+    assert_same_results(border, expected_border, 'BorderID')
+
+
+@pytest.mark.parametrize('suffix', ['.csv', '.parquet'])
+def test_stream_mpi_matches_calculate_mpi(merged, tmp_path, suffix):
+    path = str(tmp_path / f'routes{suffix}')
+    routes = merged[['MARKETID', 'BorderID', 'route_length']]
+    routes.to_csv(path, index=False) if suffix == '.csv' else routes.to_parquet(path, index=False)
+    markets = merged[['MARKETID', 'POP2020']].drop_duplicates('MARKETID')
+
+    # Small chunks so the running min/max and sums span several batches
+    market, border = stream_mpi(path, markets, chunk_rows=37)
+    expected_market, expected_border = calculate_mpi(merged)
+    assert_same_results(market, expected_market, 'MARKETID')
+    assert_same_results(border, expected_border, 'BorderID')
+
+
+def test_sweep_mpi_matches_calculate_mpi(merged):
+    sweep = sweep_mpi(merged, DECAY_PARAMS, chunk_size=2, max_workers=1)
+    _, border = calculate_mpi(merged)
+    border = border.set_index('BorderID').loc[sweep['border_ids'], COLUMNS]
+    # The sweep cubes are float32
+    np.testing.assert_allclose(sweep['border_cube'], border.to_numpy(), rtol=1e-6)
@@ -0,0 +1,33 @@
+import os
+
+import pandas as pd
+import pytest
+
+from ingest import load_workbook
+from partition import run_partitions
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'MastersheetV3.xlsx')
+
+NORTH = ('north', 33.5, 1.5, 35.5, 4.5)
+# Lake Victoria, west of every border post
+EMPTY = ('lake', 29, -3, 31, -1)
+
+
+def regions(*rows):
+    return pd.DataFrame(rows, columns=['region', 'lon_min', 'lat_min', 'lon_max', 'lat_max'])
+
+
+def test_empty_region_is_left_out_with_a_warning(tmp_path):
+    sheets = load_workbook(WORKBOOK)
+    with pytest.warns(UserWarning, match='lake'):
+        tables = run_partitions(sheets, regions(NORTH, EMPTY), {}, str(tmp_path), max_workers=1)
+    assert set(tables['mpi_border_results']['region']) == {'north'}
+    assert set(tables['ci_results']['region']) == {'north'}
+    assert sorted(tables['mpi_border_results']['BorderID']) == [2, 3, 4, 13]
+
+
+def test_only_empty_regions_give_empty_tables(tmp_path):
+    with pytest.warns(UserWarning):
+        tables = run_partitions(load_workbook(WORKBOOK), regions(EMPTY), {}, str(tmp_path), max_workers=1)
+    for name in ('mpi_market_results', 'mpi_border_results', 'ci_results'):
+        assert tables[name].empty and 'region' in tables[name].columns
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from routing import build_road_graph
+
+NODES = pd.DataFrame({'osmid': [10, 20, 30], 'x': [34.0, 34.1, 34.2], 'y': [0.5, 0.5, 0.5]})
+
+
+def edges(oneway):
+    return pd.DataFrame({'u': [10, 20], 'v': [20, 30], 'length': [100.0, 200.0], 'oneway': oneway})
+
+
+def arcs(graph):
+    coo = graph.tocoo()
+    return {(int(i), int(j)): w for i, j, w in zip(coo.row, coo.col, coo.data)}
+
+
+@pytest.mark.parametrize('oneway', [['no', 'no'], [None, None], [False, False], [0, 0], ['false', np.nan]])
+def test_two_way_values(oneway):
+    assert arcs(build_road_graph(edges(oneway), NODES)) == {(0, 1): 100, (1, 0): 100, (1, 2): 200, (2, 1): 200}
+
+
+@pytest.mark.parametrize('oneway', [['yes', 'yes'], ['True', '1'], [True, True], [1.0, 1.0]])
+def test_forward_one_way_values(oneway):
+    assert arcs(build_road_graph(edges(oneway), NODES)) == {(0, 1): 100, (1, 2): 200}
+
+
+def test_reverse_one_way_runs_from_v_to_u():
+    assert arcs(build_road_graph(edges(['-1', 'no']), NODES)) == {(1, 0): 100, (1, 2): 200, (2, 1): 200}
+    assert arcs(build_road_graph(edges([-1, 'yes']), NODES)) == {(1, 0): 100, (1, 2): 200}
+
+
+def test_no_oneway_column_is_two_way():
+    graph = build_road_graph(edges(['yes', 'yes']).drop(columns='oneway'), NODES)
+    assert len(arcs(graph)) == 4
@@ -0,0 +1,14 @@
+import numpy as np
+import pandas as pd
+
+from uncertainty import route_keys
+
+
+def test_rows_without_keys_get_routes_of_their_own():
+    routes = pd.DataFrame({'MARKETID': [1, 1, 2, np.nan, 3, 2], 'BorderID': [5, 5, 5, 5, np.nan, 5]})
+    codes, n_routes = route_keys(routes)
+    assert n_routes == 4
+    assert codes[0] == codes[1] and codes[2] == codes[5]
+    # The unmatched rows neither share a code nor fall back to -1
+    assert codes.min() >= 0 and codes.max() == n_routes - 1
+    assert len({codes[0], codes[2], codes[3], codes[4]}) == 4
@@ -0,0 +1,153 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mpi import DECAY_PARAMS
+from profiling import profiled
+
+# Relative (log-scale) noise applied to each input in every replicate
+POPULATION_SD = 0.10
+ROUTE_LENGTH_SD = 0.05
+
+# Percentiles reported for each band
+PERCENTILES = (2.5, 50, 97.5)
+
+_inputs = {}
+
+
+def lognormal_noise(rng, sd, shape):
+    """Multiplicative noise with mean 1."""
+    return rng.lognormal(-sd ** 2 / 2, sd, shape)
+
+
+def group_sums(codes, values, n_groups):
+    """Per-replicate group sums of a (replicates, rows) matrix in one bincount."""
+    n_reps = values.shape[0]
+    flat = (np.arange(n_reps)[:, None] * n_groups + codes[None, :]).ravel()
+    return np.bincount(flat, weights=values.ravel(), minlength=n_reps * n_groups).reshape(n_reps, n_groups)
+
+
+def mpi_replicates(rng, n_reps, inputs):
+    """Border-level Norm_MPI (replicates x borders x decays) under perturbed population and distance."""
+    distance, population = inputs['route_length_km'], inputs['population']
+    codes, n_borders = inputs['border_codes'], inputs['n_borders']
+    keyed = codes >= 0
+    counts = np.bincount(codes[keyed], minlength=n_borders)
+
+    market_noise = lognormal_noise(rng, inputs['population_sd'], (n_reps, inputs['n_markets']))
+    population = population * market_noise[:, inputs['market_codes']]
+    route_noise = lognormal_noise(rng, inputs['route_length_sd'], (n_reps, inputs['n_routes']))
+    distance = distance * route_noise[:, inputs['route_codes']]
+
+    results = np.empty((n_reps, n_borders, len(inputs['decays'])))
+    for k, decay in enumerate(inputs['decays']):
+        mpi = np.exp(-decay * distance) * population
+        low = mpi.min(axis=1, keepdims=True)
+        high = mpi.max(axis=1, keepdims=True)
+        norm = (mpi - low) / (high - low)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            results[:, :, k] = group_sums(codes[keyed], norm[:, keyed], n_borders) / counts
+    return results
+
+
+def ci_replicates(rng, n_reps, inputs):
+    """CI per (year, border) cell (replicates x cells) with Poisson-resampled conflict counts."""
+    n = len(inputs['fatalities'])
+    fatalities = rng.poisson(inputs['fatalities'], (n_reps, n))
+    events = rng.poisson(inputs['event_count'], (n_reps, n))
+    route_noise = lognormal_noise(rng, inputs['route_length_sd'], (n_reps, inputs['n_ci_routes']))
+    route_length_km = inputs['ci_route_length_km'] * route_noise[:, inputs['ci_route_codes']]
+    contribution = (fatalities + 0.5 * events) / route_length_km
+    return group_sums(inputs['cell_codes'], contribution, inputs['n_cells'])
+
+
+def _init_worker(inputs):
+    _inputs.update(inputs)
+
+
+def _run_block(seed, n_reps):
+    # Each block has its own seed from one SeedSequence, so results do not depend on scheduling
+    rng = np.random.default_rng(seed)
+    return mpi_replicates(rng, n_reps, _inputs), ci_replicates(rng, n_reps, _inputs)
+
+
+def route_keys(routes):
+    """Route code of each row and the number of routes.
+
+    Computed route lengths have no RouteID, but one route per market-border
+    pair. A row missing either key matches no route; it gets a code of its
+    own instead of the -1 that would index the last route's noise.
+    """
+    codes, pairs = pd.MultiIndex.from_frame(routes[['MARKETID', 'BorderID']]).factorize()
+    unmatched = codes < 0
+    codes[unmatched] = len(pairs) + np.arange(unmatched.sum())
+    return codes, len(pairs) + int(unmatched.sum())
+
+
+def prepare_inputs(merged, main_conflict, decays, population_sd, route_length_sd):
+    """Arrays shared read-only by every worker."""
+    # Rows without population or distance never contribute to MPI
+    merged = merged[merged['POP2020'].notna() & merged['route_length_km'].notna()]
+    # MAIN repeats each route once per year and event, so noise is drawn per market and per route
+    market_codes, market_ids = pd.factorize(merged['MARKETID'])
+    route_codes, n_routes = route_keys(merged)
+    border_codes, border_ids = pd.factorize(merged['BorderID'], sort=True)
+    # As in calculate_ci, rows without a year or border belong to no cell
+    main_conflict = main_conflict[main_conflict['route_length'].notna() & main_conflict['year'].notna()
+                                  & main_conflict['BorderID'].notna()]
+    ci_route_codes, n_ci_routes = route_keys(main_conflict)
+    cell_codes, cells = pd.MultiIndex.from_frame(main_conflict[['year', 'BorderID']]).factorize(sort=True)
+    inputs = {
+        'route_length_km': merged['route_length_km'].to_numpy(dtype=np.float64),
+        'population': merged['POP2020'].to_numpy(dtype=np.float64),
+        'market_codes': market_codes,
+        'n_markets': len(market_ids),
+        'route_codes': route_codes,
+        'n_routes': n_routes,
+        'border_codes': border_codes,
+        'n_borders': len(border_ids),
+        'decays': list(decays),
+        'fatalities': main_conflict['fatalities'].fillna(0).to_numpy(dtype=np.float64),
+        'event_count': main_conflict['event_count'].fillna(0).to_numpy(dtype=np.float64),
+        'ci_route_length_km': main_conflict['route_length'].to_numpy(dtype=np.float64) / 1000,
+        'ci_route_codes': ci_route_codes,
+        'n_ci_routes': n_ci_routes,
+        'cell_codes': cell_codes,
+        'n_cells': len(cells),
+        'population_sd': population_sd,
+        'route_length_sd': route_length_sd,
+    }
+    return inputs, border_ids, cells
+
+
+@profiled
+def uncertainty_bands(merged, main_conflict, n_replicates=1000, decays=DECAY_PARAMS, seed=0, block_size=50,
+                      population_sd=POPULATION_SD, route_length_sd=ROUTE_LENGTH_SD, max_workers=None):
+    """Percentile bands for border-level MPI and yearly CI from Monte Carlo replicates.
+
+    Replicates run in blocks on a process pool; within a block the
+    replicates are vectorised as (replicates x routes) matrices.
+    """
+    inputs, border_ids, cells = prepare_inputs(merged, main_conflict, decays, population_sd, route_length_sd)
+    sizes = [min(block_size, n_replicates - start) for start in range(0, n_replicates, block_size)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(inputs,)) as pool:
+        blocks = list(pool.map(_run_block, seeds, sizes))
+    mpi = np.concatenate([block[0] for block in blocks])
+    ci = np.concatenate([block[1] for block in blocks])
+
+    low, median, high = np.nanpercentile(mpi, PERCENTILES, axis=0)
+    mpi_bands = pd.DataFrame({
+        'BorderID': np.repeat(border_ids, len(decays)),
+        'decay': np.tile(decays, len(border_ids)),
+        'MPI_low': low.ravel(),
+        'MPI_median': median.ravel(),
+        'MPI_high': high.ravel(),
+    })
+
+    low, median, high = np.percentile(ci, PERCENTILES, axis=0)
+    ci_bands = cells.to_frame(index=False, name=['year', 'BorderID'])
+    ci_bands['CI_low'], ci_bands['CI_median'], ci_bands['CI_high'] = low, median, high
+    return mpi_bands, ci_bands